@@ -1,14 +1,16 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from fastapi.responses import StreamingResponse
 import os
-import json
 import sys
 
 # Add project root to path to import logic
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from logic.edt_generator import generer_edt
+from logic.database import iter_json, lire_json
+from logic.flux_json import morceaux_lignes
 
 app = FastAPI()
 
@@ -24,19 +26,24 @@ app.add_middleware(
 # Helper to load JSON
 def load_json(path):
     full_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), path)
-    if os.path.exists(full_path):
-        with open(full_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return []
+    return lire_json(full_path)
 
 @app.get("/api/schedule")
 def get_schedule():
     return load_json("GESTION EDT/emplois_du_temps.json")
 
+@app.get("/api/schedule/stream")
+def stream_schedule():
+    # JSON Lines, one session per line: read from the file and encoded as it is sent
+    full_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "GESTION EDT/emplois_du_temps.json")
+    return StreamingResponse(morceaux_lignes(iter_json(full_path)), media_type="application/x-ndjson")
+
 @app.get("/api/generate")
-def generate_schedule():
+def generate_schedule(essais: int = 1, budget: float = 0, graine: int = 0, moteur: str = "glouton"):
+    # essais > 1 or budget > 0 (seconds) switches to multi-start generation
+    # moteur="exact" tries the constraint solver first, greedy as fallback
     try:
-        edt = generer_edt()
+        edt = generer_edt(nb_essais=essais, budget_secondes=budget or None, graine=graine, moteur=moteur)
         return {"status": "success", "count": len(edt)}
     except Exception as e:
         return {"status": "error", "message": str(e)}
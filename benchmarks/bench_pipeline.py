@@ -0,0 +1,146 @@
+"""
+Benchmark du pipeline de génération sur des jeux synthétiques.
+
+Pour chaque échelle (1x, 5x, 20x, 100x par défaut) : génère le jeu dans un
+répertoire temporaire, puis mesure generate_seances(), generer_edt(),
+get_advanced_stats() et les exports. Chaque étape rapporte son temps
+réel et son pic mémoire Python (tracemalloc) ; les résultats sont écrits
+en JSON pour comparer les exécutions entre elles.
+
+Usage:
+    python -m benchmarks.bench_pipeline --echelles 1 5 --sortie bench.json
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.donnees_synthetiques import charger_reference, generer_jeu, ecrire_jeu
+
+ECHELLES = [1, 5, 20, 100]
+
+
+def mesurer(fonction, *args, memoire=True, **kwargs):
+    """Exécute fonction et retourne (résultat, mesure)."""
+    if memoire:
+        tracemalloc.start()
+    debut = time.perf_counter()
+    erreur = None
+    resultat = None
+    try:
+        resultat = fonction(*args, **kwargs)
+    except Exception as e:
+        erreur = f"{type(e).__name__}: {e}"
+    mesure = {"secondes": round(time.perf_counter() - debut, 4)}
+    if memoire:
+        mesure["pic_memoire_octets"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    if erreur:
+        mesure["erreur"] = erreur
+    return resultat, mesure
+
+
+def _exports(edt, salles, dossier, memoire):
+    """Mesure les exports ; matplotlib/pandas peuvent manquer sur la machine."""
+    mesures = {}
+    try:
+        from logic import exporter
+    except ImportError as e:
+        return {"indisponible": str(e)}
+
+    _, mesures["csv"] = mesurer(exporter.exporter_csv, edt, os.path.join(dossier, "edt.csv"), memoire=memoire)
+    _, mesures["excel"] = mesurer(exporter.exporter_excel, edt, os.path.join(dossier, "edt.xlsx"), memoire=memoire)
+    _, mesures["rapport_occupation"] = mesurer(
+        exporter.exporter_rapport_occupation, edt, salles, os.path.join(dossier, "occupation.txt"), memoire=memoire
+    )
+    # The visual export is used per group in the interfaces, not on the whole faculty
+    if edt:
+        groupe = edt[0]["groupe"]
+        extrait = [s for s in edt if s["groupe"] == groupe]
+        _, mesures["visual_un_groupe"] = mesurer(
+            exporter.exporter_visual, extrait, os.path.join(dossier, "edt.png"), "png", memoire=memoire
+        )
+    return mesures
+
+
+def bench_echelle(echelle, reference, memoire=True):
+    from logic.seance_generator import generate_seances
+    from logic.edt_generator import generer_edt
+    from logic.stats_manager import get_advanced_stats
+    from logic.database import charger_json
+
+    jeu = generer_jeu(echelle, reference)
+    dossier = tempfile.mkdtemp(prefix=f"bench_edt_{echelle}x_")
+    cwd = os.getcwd()
+    resultat = {
+        "echelle": echelle,
+        "filieres": len(jeu["filieres"]["filieres"]),
+        "modules": len(jeu["modules"]),
+        "salles": len(jeu["salles"]),
+        "enseignants": len(jeu["enseignants"]["enseignants"]),
+        "etapes": {},
+    }
+    try:
+        ecrire_jeu(jeu, dossier)
+        # logic/ works with paths relative to the project root
+        os.chdir(dossier)
+        etapes = resultat["etapes"]
+
+        _, etapes["generate_seances"] = mesurer(generate_seances, memoire=memoire)
+        seances = charger_json("DONNÉES PRINCIPALES/seances.json")
+        resultat["seances"] = len(seances)
+
+        edt, etapes["generer_edt"] = mesurer(generer_edt, memoire=memoire)
+        edt = edt or []
+        resultat["seances_placees"] = len(edt)
+        resultat["taux_placement"] = round(len(edt) / len(seances), 4) if seances else None
+
+        _, etapes["get_advanced_stats"] = mesurer(get_advanced_stats, memoire=memoire)
+        etapes["exports"] = _exports(edt, jeu["salles"], dossier, memoire)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(dossier, ignore_errors=True)
+    return resultat
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de la génération d'emploi du temps")
+    parser.add_argument("--echelles", type=int, nargs="+", default=ECHELLES)
+    parser.add_argument("--sortie", default="benchmark_results.json")
+    parser.add_argument("--sans-memoire", action="store_true",
+                        help="ne pas activer tracemalloc (temps plus fidèles, pas de pic mémoire)")
+    args = parser.parse_args(argv)
+
+    reference = charger_reference()
+    resultats = {
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu": os.cpu_count(),
+        "echelles": [],
+    }
+    for echelle in args.echelles:
+        r = bench_echelle(echelle, reference, memoire=not args.sans_memoire)
+        resultats["echelles"].append(r)
+        edt_mesure = r["etapes"].get("generer_edt", {})
+        print(f"{echelle:>4}x  {r.get('seances', 0):>6} séances  "
+              f"generer_edt {edt_mesure.get('secondes', '?')}s  "
+              f"placement {r.get('taux_placement')}")
+
+    with open(args.sortie, "w", encoding="utf-8") as f:
+        json.dump(resultats, f, indent=2, ensure_ascii=False)
+    print(f"Résultats écrits dans {args.sortie}")
+    return resultats
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Génération de jeux de données synthétiques à partir de DONNÉES PRINCIPALES.
+
+Un jeu à l'échelle k contient k copies de la faculté de référence
+(filières, modules, enseignants, salles). Chaque copie i > 1 est
+préfixée "S{i}-" pour ses filières et suffixée " [i]" pour ses
+enseignants et ses salles, ce qui garde des codes de groupes distincts
+(S2-MIPC-1-G1, ...) et la même charge par enseignant qu'en production.
+"""
+
+import copy
+import json
+import os
+
+SOURCE_DIR = "DONNÉES PRINCIPALES"
+FICHIERS = {
+    "filieres": "filieres (1).json",
+    "modules": "modules (1).json",
+    "salles": "salles.json",
+    "enseignants": "enseignants_final.json",
+    "groupes": "groupes.json",
+}
+
+
+def charger_reference(source_dir=SOURCE_DIR):
+    donnees = {}
+    for cle, nom in FICHIERS.items():
+        with open(os.path.join(source_dir, nom), "r", encoding="utf-8") as f:
+            donnees[cle] = json.load(f)
+    return donnees
+
+
+def _suffixe(nom, i):
+    return nom if i == 1 else f"{nom} [{i}]"
+
+
+def _prefixe(code, i):
+    return code if i == 1 else f"S{i}-{code}"
+
+
+def generer_jeu(echelle, reference=None):
+    """Retourne le jeu de données à l'échelle donnée, au format des fichiers source."""
+    if reference is None:
+        reference = charger_reference()
+
+    filieres_ref = reference["filieres"]
+    modules_ref = reference["modules"]
+    salles_ref = reference["salles"]
+    enseignants_ref = reference["enseignants"]
+    groupes_ref = reference["groupes"]
+
+    max_filiere = max(f["id"] for f in filieres_ref["filieres"])
+    max_module = max(m["id"] for m in modules_ref)
+    max_salle = max(s["id"] for s in salles_ref)
+    max_enseignant = max(e["id"] for e in enseignants_ref["enseignants"])
+    max_groupe = max(g["id"] for g in groupes_ref)
+
+    filieres, modules, salles, enseignants, groupes = [], [], [], [], []
+    for i in range(1, echelle + 1):
+        decalage = i - 1
+        for f in filieres_ref["filieres"]:
+            f = copy.deepcopy(f)
+            f["id"] += decalage * max_filiere
+            f["code"] = _prefixe(f["code"], i)
+            f["modules"] = [m + decalage * max_module for m in f.get("modules", [])]
+            filieres.append(f)
+        for m in modules_ref:
+            m = copy.deepcopy(m)
+            m["id"] += decalage * max_module
+            m["code"] = _prefixe(m["code"], i)
+            m["filiere_id"] += decalage * max_filiere
+            m["enseignant_id"] = m.get("enseignant_id", 0) + decalage * max_enseignant
+            m["enseignant"] = _suffixe(m.get("enseignant", "Inconnu"), i)
+            modules.append(m)
+        for s in salles_ref:
+            s = copy.deepcopy(s)
+            s["id"] += decalage * max_salle
+            s["nom"] = _suffixe(s["nom"], i)
+            salles.append(s)
+        for e in enseignants_ref["enseignants"]:
+            e = copy.deepcopy(e)
+            e["id"] += decalage * max_enseignant
+            e["nom"] = _suffixe(e["nom"], i)
+            e["modules"] = [m + decalage * max_module for m in e.get("modules", [])]
+            e["filieres"] = [f + decalage * max_filiere for f in e.get("filieres", [])]
+            enseignants.append(e)
+        for g in groupes_ref:
+            g = copy.deepcopy(g)
+            g["id"] += decalage * max_groupe
+            g["nom"] = _prefixe(g["nom"], i)
+            g["filiere_id"] += decalage * max_filiere
+            groupes.append(g)
+
+    return {
+        "filieres": dict(filieres_ref, filieres=filieres),
+        "modules": modules,
+        "salles": salles,
+        "enseignants": dict(enseignants_ref, enseignants=enseignants),
+        "groupes": groupes,
+    }
+
+
+def ecrire_jeu(jeu, racine):
+    """Écrit le jeu sous `racine` avec l'arborescence attendue par logic/."""
+    source_dir = os.path.join(racine, SOURCE_DIR)
+    os.makedirs(source_dir, exist_ok=True)
+    os.makedirs(os.path.join(racine, "GESTION EDT"), exist_ok=True)
+
+    for cle, nom in FICHIERS.items():
+        with open(os.path.join(source_dir, nom), "w", encoding="utf-8") as f:
+            json.dump(jeu[cle], f, ensure_ascii=False)
+
+    with open(os.path.join(source_dir, "availability.json"), "w", encoding="utf-8") as f:
+        json.dump({"blocked_slots": []}, f)
+    for nom in ("reservations.json", "notifications.json"):
+        with open(os.path.join(racine, "GESTION EDT", nom), "w", encoding="utf-8") as f:
+            json.dump([], f)
@@ -8,9 +8,12 @@ from logic.stats_manager import get_advanced_stats
 
 # Imports logic
 from logic.edt_generator import generer_edt
-from logic.database import charger_json, sauvegarder_json
-from logic.reservation_manager import modifier_statut_reservation, get_salles_disponibles, salle_disponible, modifier_statut_indisponibilite
+from logic.profilage import ProfilGeneration
+from logic.database import charger_json, sauvegarder_json, lire_json, iter_json
+from logic.reservation_manager import (modifier_statut_reservation, modifier_statut_reservations, get_salles_disponibles,
+                                       modifier_statut_indisponibilite, analyser_demandes, ids_sans_conflit)
 from logic.exporter import exporter_csv, exporter_rapport_occupation, exporter_excel, exporter_visual
+from logic.replanification import replanifier_edt_courant
 
 class AdminInterface:
     def __init__(self, root):
@@ -65,13 +68,13 @@ class AdminInterface:
         for w in self.tab_dashboard.winfo_children(): w.destroy()
         
         try:
-            enseignants = charger_json("DONNÉES PRINCIPALES/enseignants_final.json")
+            enseignants = lire_json("DONNÉES PRINCIPALES/enseignants_final.json")
             if isinstance(enseignants, dict): enseignants = enseignants.get("enseignants", [])
                 
-            modules = charger_json("DONNÉES PRINCIPALES/modules (1).json")
-            salles = charger_json("DONNÉES PRINCIPALES/salles.json")
+            modules = lire_json("DONNÉES PRINCIPALES/modules (1).json")
+            salles = lire_json("DONNÉES PRINCIPALES/salles.json")
             etudiants = 0 
-            filieres = charger_json("DONNÉES PRINCIPALES/filieres (1).json")
+            filieres = lire_json("DONNÉES PRINCIPALES/filieres (1).json")
             if "statistiques" in filieres:
                 etudiants = filieres["statistiques"].get("total_etudiants", 0)
             
@@ -134,8 +137,11 @@ class AdminInterface:
 
     def _generation_process(self):
         try:
-            edt = generer_edt()
+            profil = ProfilGeneration()
+            edt = generer_edt(profil=profil)
             self.root.after(0, lambda: self.log(f"Placement terminé ! {len(edt)} séances placées.", "success"))
+            for ligne in profil.resume():
+                self.root.after(0, lambda l=ligne: self.log(l, "info"))
             self.root.after(0, lambda: messagebox.showinfo("Succès", "L'emploi du temps a été généré."))
             self.root.after(0, self.setup_occupancy) # Refresh occupancy view
         except Exception as e:
@@ -146,10 +152,13 @@ class AdminInterface:
         
         lbl = ttk.Label(self.tab_reservations, text="Demandes de Réservation", font=("Helvetica", 14, "bold"))
         lbl.pack(pady=10)
+        ttk.Label(self.tab_reservations, text="Ctrl/Maj + clic pour traiter plusieurs demandes à la fois.",
+                  font=("Helvetica", 8, "italic")).pack()
         
-        columns = ("ID", "Enseignant", "Salle", "Jour", "Début", "Motif", "Statut")
+        columns = ("ID", "Enseignant", "Salle", "Jour", "Début", "Motif", "Statut", "Conflit", "Suggestion")
         self.tree_resa = ttk.Treeview(self.tab_reservations, columns=columns, show="headings")
         for col in columns: self.tree_resa.heading(col, text=col)
+        self.tree_resa.tag_configure("conflit", foreground="red")
         
         self.tree_resa.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
         
@@ -158,11 +167,14 @@ class AdminInterface:
         
         ttk.Button(btn_box, text="Accepter", command=lambda: self.handle_resa("Acceptée")).pack(side=tk.LEFT, padx=5)
         ttk.Button(btn_box, text="Rejeter", command=lambda: self.handle_resa("Refusée")).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_box, text="Accepter toutes sans conflit", command=self.accept_all_without_conflict).pack(side=tk.LEFT, padx=5)
         ttk.Button(btn_box, text="Rafraîchir", command=self.setup_reservations).pack(side=tk.LEFT, padx=5)
         
         # Load data
         try:
-            resas = charger_json("GESTION EDT/reservations.json")
+            resas = lire_json("GESTION EDT/reservations.json")
+            # Conflicts of all pending requests in one pass
+            analyse = analyser_demandes()
             for r in resas:
                 # Robust loading: use .get for all fields
                 rid = r.get("id", "N/A")
@@ -172,8 +184,12 @@ class AdminInterface:
                 debut = r.get("debut", "?")
                 motif = r.get("motif", "")
                 statut = r.get("statut", "En attente")
+                info = analyse.get(rid, {})
+                conflit = info.get("conflit", "")
+                suggestion = info.get("suggestion") or r.get("suggestion", "")
                 
-                self.tree_resa.insert("", tk.END, values=(rid, ens, salle, jour, debut, motif, statut))
+                self.tree_resa.insert("", tk.END, values=(rid, ens, salle, jour, debut, motif, statut, conflit, suggestion),
+                                      tags=("conflit",) if conflit or statut == "Conflit" else ())
         except Exception as e:
             print(f"Erreur chargement reservations: {e}")
 
@@ -182,6 +198,19 @@ class AdminInterface:
         if not selected:
             messagebox.showwarning("Attention", "Veuillez sélectionner une demande.")
             return
+
+        if len(selected) > 1:
+            # Several requests: one batch, conflicting ones are left pending
+            ids = [self.tree_resa.item(i)['values'][0] for i in selected]
+            modifiees, conflits = modifier_statut_reservations(ids, status)
+            msg = f"{len(modifiees)} demande(s) {status.lower()}(s)."
+            if conflits:
+                msg += f"\n{len(conflits)} demande(s) en conflit laissée(s) en attente :"
+                msg += "".join(f"\n  {i} : {motif}" for i, motif in conflits.items())
+            messagebox.showinfo("Traitement groupé", msg)
+            self.setup_reservations()
+            self.setup_occupancy()
+            return
         
         item = self.tree_resa.item(selected[0])
         resa_id = item['values'][0]
@@ -190,19 +219,25 @@ class AdminInterface:
         jr = item['values'][3]
         start = item['values'][4]
         
-        # Double check availability if accepting
-        if status == "Acceptée":
-            if not salle_disponible(salle, jr, start):
-                messagebox.showerror("Conflit", f"La salle {salle} est déjà occupée le {jr} à {start}.\n\nVous ne pouvez pas accepter cette demande.")
-                return
-        
-        if modifier_statut_reservation(resa_id, status):
+        # Acceptance re-checks the room (occupied or blocked) and gives the reason of a refusal
+        ok, motif = modifier_statut_reservation(resa_id, status)
+        if ok:
             msg = f"La demande de {ens} a été {status.lower()}."
             messagebox.showinfo("Succès", msg)
             self.setup_reservations()
             self.setup_occupancy()
         else:
-            messagebox.showerror("Erreur", "Impossible de modifier le statut.")
+            messagebox.showerror("Erreur", f"Impossible de modifier le statut.\n\n{motif}")
+
+    def accept_all_without_conflict(self):
+        ids = ids_sans_conflit()
+        if not ids:
+            messagebox.showinfo("Info", "Aucune demande en attente sans conflit.")
+            return
+        modifiees, conflits = modifier_statut_reservations(ids, "Acceptée")
+        messagebox.showinfo("Traitement groupé", f"{len(modifiees)} demande(s) acceptée(s).")
+        self.setup_reservations()
+        self.setup_occupancy()
 
     def setup_occupancy(self):
         for w in self.tab_occupancy.winfo_children(): w.destroy()
@@ -211,8 +246,8 @@ class AdminInterface:
         lbl.pack(pady=10)
         
         try:
-            edt = charger_json("GESTION EDT/emplois_du_temps.json")
-            salles = charger_json("DONNÉES PRINCIPALES/salles.json")
+            edt = lire_json("GESTION EDT/emplois_du_temps.json")
+            salles = lire_json("DONNÉES PRINCIPALES/salles.json")
             
             occ_data = {s['nom']: 0 for s in salles}
             for s in edt:
@@ -245,7 +280,7 @@ class AdminInterface:
         
         ttk.Label(form, text="Enseignant:").grid(row=0, column=0, pady=5)
         try:
-            ens_data = charger_json("DONNÉES PRINCIPALES/enseignants_final.json")
+            ens_data = lire_json("DONNÉES PRINCIPALES/enseignants_final.json")
             if isinstance(ens_data, dict): ens_data = ens_data.get("enseignants", [])
             ens_names = [e["nom"] for e in ens_data]
         except: ens_names = []
@@ -313,7 +348,15 @@ class AdminInterface:
             
             avail["blocked_slots"].append(block_item)
             sauvegarder_json("DONNÉES PRINCIPALES/availability.json", avail)
-            messagebox.showinfo("Succès", "Le créneau a été bloqué avec succès.")
+
+            # Move only the séances hit by the new block
+            deplacees, non_resolues = replanifier_edt_courant()
+            msg = "Le créneau a été bloqué avec succès."
+            if deplacees:
+                msg += f"\n{len(deplacees)} séance(s) déplacée(s) dans l'emploi du temps."
+            if non_resolues:
+                msg += f"\n{len(non_resolues)} séance(s) n'ont pas pu être replacées."
+            messagebox.showinfo("Succès", msg)
             self.refresh_blocked()
         except Exception as e:
             messagebox.showerror("Erreur", str(e))
@@ -358,7 +401,7 @@ class AdminInterface:
     def refresh_blocked(self):
         for i in self.tree_blocked.get_children(): self.tree_blocked.delete(i)
         try:
-            avail = charger_json("DONNÉES PRINCIPALES/availability.json")
+            avail = lire_json("DONNÉES PRINCIPALES/availability.json")
             for b in avail.get("blocked_slots", []):
                 self.tree_blocked.insert("", tk.END, values=(
                     b["enseignant"], 
@@ -372,7 +415,8 @@ class AdminInterface:
     def export_edt_csv(self):
         path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV", "*.csv")])
         if path:
-            edt = charger_json("GESTION EDT/emplois_du_temps.json")
+            # Streamed from the file: the timetable is never fully loaded for a CSV export
+            edt = iter_json("GESTION EDT/emplois_du_temps.json")
             if exporter_csv(edt, path):
                 messagebox.showinfo("Succès", "Export CSV réussi.")
             else:
@@ -455,7 +499,7 @@ class AdminInterface:
         frame.columnconfigure(0, weight=1)
         frame.rowconfigure(0, weight=1)
         try:
-            data = charger_json(file_path)
+            data = lire_json(file_path)
             if isinstance(data, dict):
                 for key, value in data.items():
                     if isinstance(value, list) and len(value) > 0 and isinstance(value[0], dict):
@@ -542,7 +586,7 @@ class AdminInterface:
             self.cb_filter_choice.configure(state="normal")
             try:
                 # Extract unique filieres prefixes
-                filieres_data = charger_json("DONNÉES PRINCIPALES/filieres (1).json")
+                filieres_data = lire_json("DONNÉES PRINCIPALES/filieres (1).json")
                 if isinstance(filieres_data, dict): filieres_data = filieres_data.get("filieres", [])
                 
                 # User request: Separate years (GEGM-1 vs GEGM-2)
@@ -558,7 +602,7 @@ class AdminInterface:
             self.cb_filter_choice.configure(state="normal")
             try:
                 # Get teachers from EDT or data? EDT is better to valid data.
-                edt = charger_json("GESTION EDT/emplois_du_temps.json")
+                edt = lire_json("GESTION EDT/emplois_du_temps.json")
                 teachers = sorted(list(set(s.get('enseignant', '') for s in edt if s.get('enseignant'))))
                 self.cb_filter_choice['values'] = teachers
             except: self.cb_filter_choice['values'] = []
@@ -576,11 +620,11 @@ class AdminInterface:
             return
 
         try:
-            edt = charger_json("GESTION EDT/emplois_du_temps.json")
+            edt = lire_json("GESTION EDT/emplois_du_temps.json")
             filtered = []
             
             if choice == "Global":
-                filtered = edt
+                filtered = list(edt)
             elif choice == "Filiere":
                 # Filter by starts_with of code/groupe/filiere
                 # In EDT, we have 'filiere' field usually.
@@ -707,9 +751,9 @@ class AdminInterface:
         hh = self.cb_real_heure.get()
         
         try:
-            salles = charger_json("DONNÉES PRINCIPALES/salles.json")
-            edt = charger_json("GESTION EDT/emplois_du_temps.json")
-            resas = charger_json("GESTION EDT/reservations.json")
+            salles = lire_json("DONNÉES PRINCIPALES/salles.json")
+            edt = lire_json("GESTION EDT/emplois_du_temps.json")
+            resas = lire_json("GESTION EDT/reservations.json")
             
             # Use Canvas for grid
             canvas = tk.Canvas(self.rooms_container)
@@ -785,7 +829,7 @@ class AdminInterface:
         
         # Load data
         try:
-            requests = charger_json("GESTION EDT/unavailability_requests.json") or []
+            requests = lire_json("GESTION EDT/unavailability_requests.json") or []
             for req in requests:
                 rid = req.get("id", "N/A")
                 ens = req.get("enseignant", "Inconnu")
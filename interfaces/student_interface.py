@@ -2,7 +2,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import os
 import datetime
-from logic.database import charger_json
+from logic.database import lire_json
 from logic.reservation_manager import get_salles_disponibles
 from logic.exporter import exporter_csv, exporter_excel, exporter_visual
 
@@ -124,7 +124,7 @@ class StudentInterface:
         free_room_names = get_salles_disponibles(day, time)
         
         try:
-            all_salles = charger_json("DONNÉES PRINCIPALES/salles.json")
+            all_salles = lire_json("DONNÉES PRINCIPALES/salles.json")
             filtered_rooms = []
             for s in all_salles:
                 if s["nom"] in free_room_names:
@@ -142,7 +142,7 @@ class StudentInterface:
 
     def load_filieres(self):
         try:
-            data = charger_json("DONNÉES PRINCIPALES/filieres (1).json")
+            data = lire_json("DONNÉES PRINCIPALES/filieres (1).json")
             if isinstance(data, dict): return data.get("filieres", [])
             return data
         except: return []
@@ -150,7 +150,7 @@ class StudentInterface:
     def on_filiere_selected(self, event):
         filiere_code = self.selected_filiere.get()
         try:
-            seances = charger_json("DONNÉES PRINCIPALES/seances.json")
+            seances = lire_json("DONNÉES PRINCIPALES/seances.json")
             all_groups = sorted(list(set([s.get('groupe', '') for s in seances if s.get('filiere') == filiere_code])))
             
             # If sub-groups like G1, G2 exist, filter out the base filiere code
@@ -192,7 +192,7 @@ class StudentInterface:
         group = self.selected_group.get()
         if not group: return
         try:
-            edt = charger_json("GESTION EDT/emplois_du_temps.json")
+            edt = lire_json("GESTION EDT/emplois_du_temps.json")
             my_sessions = []
             for s in edt:
                 if s.get('groupe') == group or (s.get('filiere') == filiere and s.get('type') == 'Cours'):
@@ -215,7 +215,7 @@ class StudentInterface:
             return []
         
         try:
-            edt = charger_json("GESTION EDT/emplois_du_temps.json")
+            edt = lire_json("GESTION EDT/emplois_du_temps.json")
             my_sessions = []
             for s in edt:
                 if s.get('groupe') == group or (s.get('filiere') == filiere and s.get('type') == 'Cours'):
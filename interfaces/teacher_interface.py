@@ -1,9 +1,12 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from logic.database import charger_json, sauvegarder_json
-from logic.reservation_manager import ajouter_reservation, rechercher_salles, ajouter_demande_indisponibilite
+from logic.database import lire_json
+from logic.notifications import boite
+from logic.reservation_manager import ajouter_reservation, ajouter_serie_reservations, rechercher_salles, ajouter_demande_indisponibilite
 from logic.exporter import exporter_csv, exporter_excel, exporter_visual
 
+PAGE_NOTIFS = 50
+
 class TeacherInterface:
     def normalize_name(self, name):
         """Standardize name for comparison: lower, remove titles, strip."""
@@ -54,7 +57,7 @@ class TeacherInterface:
 
     def load_teachers(self):
         try:
-            data = charger_json("DONNÉES PRINCIPALES/enseignants_final.json")
+            data = lire_json("DONNÉES PRINCIPALES/enseignants_final.json")
             if isinstance(data, dict):
                 return data.get("enseignants", [])
             return data
@@ -101,7 +104,7 @@ class TeacherInterface:
         
         # Load EDT
         try:
-            edt = charger_json("GESTION EDT/emplois_du_temps.json")
+            edt = lire_json("GESTION EDT/emplois_du_temps.json")
             my_sessions = []
             
             # Helper for matching
@@ -265,6 +268,14 @@ class TeacherInterface:
         self.cb_motif = ttk.Combobox(f_grid, values=["Cours supplémentaire", "Rattrapage", "Réunion pédagogique", "Examen exceptionnel", "Autre"])
         self.cb_motif.current(1)
         self.cb_motif.grid(row=1, column=1, padx=5, pady=5)
+
+        # Same room on several weekly slots: one request per selected slot
+        ttk.Label(f_grid, text="Autres créneaux:").grid(row=1, column=2, padx=5, pady=5, sticky="n")
+        self.list_autres_creneaux = tk.Listbox(f_grid, selectmode=tk.MULTIPLE, height=4, exportselection=False, width=30)
+        for jour in self.cb_search_day["values"]:
+            for heure in self.cb_search_hour["values"]:
+                self.list_autres_creneaux.insert(tk.END, f"{jour} à {heure}")
+        self.list_autres_creneaux.grid(row=1, column=3, padx=5, pady=5)
         
         ttk.Button(final_frame, text="Envoyer la Demande", command=self.submit_reservation_advanced).pack(pady=10)
 
@@ -327,6 +338,23 @@ class TeacherInterface:
              messagebox.showerror("Erreur", "Format de créneau invalide.")
              return
 
+        creneaux = [(jour, debut)]
+        for i in self.list_autres_creneaux.curselection():
+            creneau = tuple(self.list_autres_creneaux.get(i).split(" à "))
+            if creneau not in creneaux:
+                creneaux.append(creneau)
+        if len(creneaux) > 1:
+            # One batch: conflicting slots are reported, the others are sent
+            envoyees, conflits = ajouter_serie_reservations(
+                self.selected_teacher.get(), salle, creneaux, self.cb_motif.get()
+            )
+            msg = f"{len(envoyees)} demande(s) envoyée(s) à l'administration."
+            if conflits:
+                msg += f"\nSalle {salle} déjà prise : " + ", ".join(f"{r['jour']} à {r['debut']}" for r in conflits)
+            (messagebox.showinfo if envoyees else messagebox.showerror)("Demandes groupées", msg)
+            self.list_autres_creneaux.selection_clear(0, tk.END)
+            return
+
         resa = {
             "enseignant": self.selected_teacher.get(),
             "salle": salle,
@@ -342,7 +370,7 @@ class TeacherInterface:
             self.entry_final_salle.delete(0, tk.END)
             self.entry_final_salle.configure(state="readonly")
         else:
-            messagebox.showerror("Erreur", "Erreur lors de l'enregistrement.")
+            messagebox.showerror("Conflit", f"La salle {salle} n'est plus libre le {jour} à {debut}.")
 
     def submit_reservation(self):
         # Validation
@@ -376,9 +404,14 @@ class TeacherInterface:
         self.tree_notif.heading("Statut", text="Décision")
         self.tree_notif.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
         
+        self.lbl_non_lues = ttk.Label(self.tab_notif, text="")
+        self.lbl_non_lues.pack()
+        self.nb_notifs_affichees = PAGE_NOTIFS
+
         btn_box = ttk.Frame(self.tab_notif)
         btn_box.pack(pady=10)
         ttk.Button(btn_box, text="Marquer comme lu", command=self.mark_as_read).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_box, text="Afficher plus", command=self.show_more_notifs).pack(side=tk.LEFT, padx=5)
         ttk.Button(btn_box, text="Rafraîchir", command=self.refresh_notifs).pack(side=tk.LEFT, padx=5)
 
     def refresh_notifs(self):
@@ -390,29 +423,34 @@ class TeacherInterface:
         if not teacher_name: return
         
         try:
-            notifs = charger_json("GESTION EDT/notifications.json") or []
-            # Filter for this teacher
-            my_notifs = [n for n in notifs if n["enseignant"] == teacher_name]
-            my_notifs.sort(key=lambda x: x["date"], reverse=True)
+            # Per-teacher index: only the latest page is read
+            my_notifs = boite.notifications(teacher_name, limite=self.nb_notifs_affichees)
             
             for n in my_notifs:
                 details = f"{n['jour']} à {n['debut']} - Salle: {n['salle']}"
+                if n.get("suggestion"):
+                    details += f" (proposée : {n['suggestion']})"
                 tag = "new" if not n.get("lu") else ""
                 self.tree_notif.insert("", tk.END, values=(n["date"], details, n["statut"]), tags=(tag,))
             
             self.tree_notif.tag_configure("new", background="#e1f5fe")
+            total = boite.nb_notifications(teacher_name)
+            self.lbl_non_lues.configure(
+                text=f"{boite.nb_non_lues(teacher_name)} non lue(s) — {len(my_notifs)} affichée(s) sur {total}"
+            )
         except: pass
 
+    def show_more_notifs(self):
+        self.nb_notifs_affichees += PAGE_NOTIFS
+        self.refresh_notifs()
+
     def mark_as_read(self):
         teacher_name = self.selected_teacher.get()
         if not teacher_name: return
         
         try:
-            notifs = charger_json("GESTION EDT/notifications.json") or []
-            for n in notifs:
-                if n["enseignant"] == teacher_name:
-                    n["lu"] = True
-            sauvegarder_json("GESTION EDT/notifications.json", notifs)
+            # One write for all unread notifications
+            boite.marquer_lues(teacher_name)
             self.refresh_notifs()
         except: pass
 
@@ -501,7 +539,7 @@ class TeacherInterface:
                 break
         
         try:
-            edt = charger_json("GESTION EDT/emplois_du_temps.json")
+            edt = lire_json("GESTION EDT/emplois_du_temps.json")
             my_sessions = []
             
             def distinct_words(n):
@@ -6,6 +6,7 @@ Date: 2026-01-10
 
 import json
 import os
+import threading
 from typing import Any, Dict, List, Optional
 
 
@@ -202,19 +203,31 @@ def get_by_id(filename: str, item_id: int) -> Optional[Dict[str, Any]]:
         Optional[Dict[str, Any]]: L'élément trouvé ou None
     """
     try:
-        data = load_json(filename)
-        
-        for item in data:
-            if item.get('id') == item_id:
-                return item
-        
-        return None
+        if not os.path.exists(filename):
+            raise FileNotFoundError(f"Le fichier '{filename}' n'existe pas.")
+        item = _index_ids(filename).get(item_id)
+        # Mutable copy, as load_json used to return
+        return None if item is None else json.loads(json.dumps(item))
         
     except Exception as e:
         print(f"Erreur lors de la recherche: {str(e)}")
         return None
 
 
+_index_cache = {}
+
+
+def _index_ids(filename: str) -> Dict[Any, Dict[str, Any]]:
+    """Index ID -> élément, reconstruit seulement quand lire_json voit le fichier changer."""
+    data = lire_json(filename)
+    cle = os.path.abspath(filename)
+    entree = _index_cache.get(cle)
+    if entree is None or entree[0] is not data:
+        entree = (data, {item.get('id'): item for item in data if isinstance(item, dict)})
+        _index_cache[cle] = entree
+    return entree[1]
+
+
 def filter_data(filename: str, **kwargs) -> List[Dict[str, Any]]:
     """
     Filtre les données selon des critères.
@@ -267,6 +280,125 @@ def get_all(filename: str) -> List[Dict[str, Any]]:
         return []
 
 
+# ============================================================================
+# TRANSACTIONS (ÉDITIONS EN LOT)
+# ============================================================================
+
+class Transaction:
+    """
+    Session d'édition d'un fichier JSON : un seul chargement, une seule écriture.
+
+    Les ajouts, mises à jour et suppressions se font en mémoire avec un index
+    par ID (get_by_id en O(1)) ; commit() réécrit le fichier une fois.
+    Utilisée comme context manager, elle valide à la sortie du bloc sauf en
+    cas d'exception.
+
+    Example:
+        >>> with Transaction('modules.json') as t:
+        ...     for m in nouveaux_modules:
+        ...         t.add(m)
+        ...     t.update(12, {'enseignant_id': 4})
+    """
+
+    def __init__(self, filename: str, creer: bool = True):
+        """
+        Args:
+            filename (str): Nom du fichier JSON
+            creer (bool): Partir d'une liste vide si le fichier n'existe pas
+        """
+        self.filename = filename
+        self.creer = creer
+        if not creer and not os.path.exists(filename):
+            raise FileNotFoundError(filename)
+        # Same read path as the writes: journal and SQLite included
+        self._items = charger_json(filename) or []
+        self._index = {item.get('id'): i for i, item in enumerate(self._items) if item.get('id') is not None}
+        self._supprimes = 0
+        self._max_id = max((k for k in self._index if isinstance(k, int)), default=0)
+        self.modifie = False
+
+    def __enter__(self) -> 'Transaction':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        return False
+
+    def add(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Ajoute un élément (ID généré s'il est absent).
+
+        Raises:
+            ValueError: Si l'ID existe déjà
+        """
+        if 'id' not in item:
+            item['id'] = self._max_id + 1
+        if item['id'] in self._index:
+            raise ValueError(f"Un élément avec l'ID {item['id']} existe déjà.")
+        if isinstance(item['id'], int):
+            self._max_id = max(self._max_id, item['id'])
+        self._index[item['id']] = len(self._items)
+        self._items.append(item)
+        self.modifie = True
+        return item
+
+    def update(self, item_id: Any, new_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Fusionne new_data dans l'élément (l'ID ne change pas) ; None si absent."""
+        i = self._index.get(item_id)
+        if i is None:
+            return None
+        item = self._items[i]
+        item.update(new_data)
+        item['id'] = item_id
+        self.modifie = True
+        return item
+
+    def delete(self, item_id: Any) -> bool:
+        """Supprime l'élément ; False s'il n'existe pas."""
+        i = self._index.pop(item_id, None)
+        if i is None:
+            return False
+        # Tombstone: positions of the other items stay valid until commit
+        self._items[i] = None
+        self._supprimes += 1
+        self.modifie = True
+        return True
+
+    def get_by_id(self, item_id: Any) -> Optional[Dict[str, Any]]:
+        i = self._index.get(item_id)
+        return None if i is None else self._items[i]
+
+    def filter(self, **kwargs) -> List[Dict[str, Any]]:
+        """Éléments dont tous les champs donnés sont égaux (key=value)."""
+        return [
+            item for item in self._items
+            if item is not None and all(item.get(k) == v for k, v in kwargs.items())
+        ]
+
+    def all(self) -> List[Dict[str, Any]]:
+        return [item for item in self._items if item is not None]
+
+    def __len__(self) -> int:
+        return len(self._items) - self._supprimes
+
+    def commit(self) -> bool:
+        """Écrit le fichier une seule fois s'il y a eu des modifications."""
+        if not self.modifie:
+            return False
+        self._items = self.all()
+        self._index = {item.get('id'): i for i, item in enumerate(self._items) if item.get('id') is not None}
+        self._supprimes = 0
+        # Atomic locked write, cached views invalidated
+        sauvegarder_json(self.filename, self._items)
+        self.modifie = False
+        return True
+
+    def rollback(self):
+        """Abandonne les modifications en rechargeant le fichier."""
+        self.__init__(self.filename, self.creer)
+
+
 if __name__ == "__main__":
     # Tests unitaires
     print("=== Tests du module database.py ===\n")
@@ -300,6 +432,15 @@ if __name__ == "__main__":
     print("\nTest 6: Suppression")
     delete_data(test_file, 2)
     
+    # Test 7: Transaction (une seule écriture)
+    print("\nTest 7: Transaction")
+    with Transaction(test_file) as t:
+        for i in range(200):
+            t.add({"nom": f"Lot {i}", "value": i})
+        t.update(1, {"value": 0})
+        t.delete(3)
+    print(f"Éléments après transaction: {count_items(test_file)}, ID 5: {get_by_id(test_file, 5)}")
+    
     # Nettoyage
     if os.path.exists(test_file):
         os.remove(test_file)
@@ -309,12 +450,331 @@ if __name__ == "__main__":
 import json
 import os
 
+from logic.ecriture import file_ecriture
+from logic.flux_json import FORMATS, charger_flux, iter_enregistrements
+from logic.instantane import charger_instantane, ecrire_instantane
+
+# JSON files that also get a binary snapshot (see logic/instantane.py)
+FICHIERS_INSTANTANES = ["GESTION EDT/emplois_du_temps.json"]
+
+# "indent" (historical, byte-compatible), "compact" or "lignes"; .jsonl/.gz paths decide for themselves
+FORMAT_JSON = os.environ.get("EDT_FORMAT_JSON", "indent")
+
+def definir_format_json(format):
+    """Format d'écriture de sauvegarder_json (voir logic/flux_json.py)."""
+    global FORMAT_JSON
+    if format not in FORMATS:
+        raise ValueError(f"Format JSON inconnu : {format}")
+    FORMAT_JSON = format
+
 def charger_json(chemin):
+    journal = journal_de(chemin)
+    if journal is not None:
+        return journal.etat()
+    return _charger_base(chemin)
+
+def sauvegarder_json(chemin, data):
+    journal = journal_de(chemin)
+    if journal is not None:
+        journal.remplacer(data)
+    else:
+        _sauvegarder_base(chemin, data)
+    depot.invalider(chemin)
+
+def _a_instantane(chemin):
+    return "/".join(os.path.normpath(chemin).split(os.sep)[-2:]) in FICHIERS_INSTANTANES
+
+def _table_instantane(chemin):
+    """SeanceTable de l'instantané binaire s'il est à jour, sinon None."""
+    if _stockage is not None and _stockage.gere(chemin):
+        return None
+    return charger_instantane(chemin) if _a_instantane(chemin) else None
+
+def _charger_base(chemin):
+    if _stockage is not None and _stockage.gere(chemin):
+        return _stockage.charger(chemin)
+    table = _table_instantane(chemin)
+    if table is not None:
+        return table.to_dicts()
     if not os.path.exists(chemin):
         return []
-    with open(chemin, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return charger_flux(chemin)
 
-def sauvegarder_json(chemin, data):
-    with open(chemin, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
+def _sauvegarder_base(chemin, data):
+    if _stockage is not None and _stockage.gere(chemin):
+        _stockage.sauvegarder(chemin, data)
+    else:
+        apres = None
+        if _a_instantane(chemin):
+            # Written under the JSON's lock, signed with the stat of the file just written
+            def apres():
+                try:
+                    ecrire_instantane(chemin, data)
+                except Exception as e:
+                    # The JSON is saved; readers just fall back to it
+                    print(f"Snapshot not written for {chemin}: {e}")
+        # Single writer thread, file lock, temp file + atomic rename
+        file_ecriture.soumettre(chemin, data, format=FORMAT_JSON, apres=apres)
+
+def _signature_base(chemin):
+    """Change quand le contenu de base change ; None si le fichier n'existe pas."""
+    if _stockage is not None and _stockage.gere(chemin):
+        return _stockage.signature()
+    try:
+        st = os.stat(chemin)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+# ============================================================================
+# JOURNAL EN AJOUT SEUL (RÉSERVATIONS, DEMANDES, NOTIFICATIONS)
+# ============================================================================
+
+FICHIERS_JOURNALISES = [
+    "GESTION EDT/reservations.json",
+    "GESTION EDT/notifications.json",
+    "GESTION EDT/unavailability_requests.json",
+]
+
+_journaux = {}
+_verrou_journaux = threading.Lock()
+
+
+def _sqlite_gere(chemin):
+    return _stockage is not None and _stockage.gere(chemin)
+
+
+def journal_de(chemin):
+    """JournalJSON du fichier s'il est journalisé, sinon None (y compris si SQLite le gère)."""
+    if "/".join(os.path.normpath(chemin).split(os.sep)[-2:]) not in FICHIERS_JOURNALISES:
+        return None
+    if _sqlite_gere(chemin):
+        # Rows are appended and updated in the database itself
+        return None
+    cle = os.path.abspath(chemin)
+    journal = _journaux.get(cle)
+    if journal is None:
+        from logic.journal import JournalJSON
+        with _verrou_journaux:
+            journal = _journaux.setdefault(
+                cle, JournalJSON(cle, _charger_base, _sauvegarder_base, _signature_base)
+            )
+    return journal
+
+
+def ajouter_enregistrement(chemin, enregistrement):
+    """Ajoute un enregistrement sans réécrire le fichier quand il est journalisé."""
+    ajouter_enregistrements(chemin, [enregistrement])
+    return enregistrement
+
+
+def modifier_enregistrement(chemin, id_enregistrement, champs):
+    """Met à jour les champs de l'enregistrement `id`. Retourne False s'il n'existe pas."""
+    return bool(modifier_enregistrements(chemin, {id_enregistrement: champs}))
+
+
+def ajouter_enregistrements(chemin, enregistrements):
+    """Ajoute un lot d'enregistrements en une seule écriture."""
+    if not enregistrements:
+        return enregistrements
+    journal = journal_de(chemin)
+    if journal is not None:
+        journal.ajouter_lot(enregistrements)
+    elif _sqlite_gere(chemin):
+        _stockage.ajouter(chemin, enregistrements)
+    else:
+        data = charger_json(chemin) or []
+        data.extend(enregistrements)
+        sauvegarder_json(chemin, data)
+        return enregistrements
+    depot.invalider(chemin)
+    return enregistrements
+
+
+def modifier_enregistrements(chemin, modifications):
+    """
+    Applique {id: champs} en une seule écriture.
+
+    Returns:
+        list: ids effectivement modifiés
+    """
+    journal = journal_de(chemin)
+    if journal is not None:
+        ids = journal.modifier_lot(modifications)
+        depot.invalider(chemin)
+        return ids
+    if _sqlite_gere(chemin):
+        ids = _stockage.modifier(chemin, modifications)
+        depot.invalider(chemin)
+        return ids
+    data = charger_json(chemin) or []
+    ids = []
+    for item in data:
+        champs = modifications.get(item.get("id"))
+        if champs is not None:
+            item.update(champs)
+            ids.append(item["id"])
+    if ids:
+        sauvegarder_json(chemin, data)
+    return ids
+
+
+# ============================================================================
+# STOCKAGE SQLITE (OPTIONNEL)
+# ============================================================================
+
+_stockage = None
+
+
+def activer_sqlite(chemin=None, importer=False):
+    """
+    Route les fichiers de GESTION EDT/ et availability.json vers SQLite.
+
+    Args:
+        chemin (str): Base SQLite (défaut : GESTION EDT/edt.sqlite3)
+        importer (bool): Copier d'abord les fichiers JSON existants dans la base
+
+    Returns:
+        StockageSQLite: le stockage actif, pour ses requêtes indexées
+    """
+    global _stockage
+    from logic.stockage_sqlite import StockageSQLite, SQLITE_PATH
+    stockage = StockageSQLite(chemin or SQLITE_PATH)
+    if importer:
+        # Fold pending journal lines into the JSON files before copying them
+        for fichier in FICHIERS_JOURNALISES:
+            journal = journal_de(fichier)
+            if journal is not None and os.path.exists(journal.journal):
+                journal.compacter()
+        stockage.importer_json()
+    _stockage = stockage
+    depot.invalider()
+    return stockage
+
+
+def desactiver_sqlite():
+    """Revient aux fichiers JSON (sans exporter la base)."""
+    global _stockage
+    _stockage = None
+    depot.invalider()
+
+
+def stockage_sqlite():
+    """Stockage SQLite actif, ou None si les fichiers JSON sont utilisés."""
+    return _stockage
+
+
+# ============================================================================
+# DÉPÔT EN MÉMOIRE (LECTURE SEULE)
+# ============================================================================
+
+class VueLectureSeule(TypeError):
+    """Levée lors d'une tentative de modification d'une vue du dépôt."""
+
+
+def _interdit(self, *args, **kwargs):
+    raise VueLectureSeule("Vue en lecture seule : utilisez charger_json() pour modifier les données.")
+
+
+class DictLecture(dict):
+    """dict non modifiable (reste sérialisable en JSON comme un dict)."""
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = _interdit
+    __ior__ = _interdit
+
+    def __reduce__(self):
+        return (self.__class__, (dict(self),))
+
+
+class ListeLecture(list):
+    """list non modifiable (reste sérialisable en JSON comme une list)."""
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _interdit
+    append = extend = insert = pop = remove = clear = sort = reverse = _interdit
+
+    def __reduce__(self):
+        return (self.__class__, (list(self),))
+
+
+def figer(valeur):
+    """Copie en lecture seule (DictLecture / ListeLecture) d'une valeur JSON."""
+    if isinstance(valeur, list):
+        return ListeLecture(figer(v) for v in valeur)
+    if isinstance(valeur, dict):
+        return DictLecture((k, figer(v)) for k, v in valeur.items())
+    return valeur
+
+
+class DepotJSON:
+    """
+    Cache partagé des fichiers JSON parsés.
+
+    Un fichier n'est relu que si son mtime ou sa taille (ou son journal) a
+    changé depuis le dernier chargement ; sauvegarder_json() invalide
+    l'entrée concernée.
+    Les données renvoyées sont des vues en lecture seule partagées entre
+    tous les appelants : pour modifier puis sauvegarder, passer par
+    charger_json() qui renvoie une copie fraîche.
+    """
+
+    def __init__(self):
+        self._entrees = {}
+        self._verrou = threading.Lock()
+        # Bumped on every write made by this process, for caches built on top of the depot
+        self.generation = 0
+
+    def lire(self, chemin):
+        cle = os.path.abspath(chemin)
+        journal = journal_de(cle)
+        signature = journal.signature() if journal is not None else _signature_base(cle)
+        if signature is None:
+            return ListeLecture()
+
+        entree = self._entrees.get(cle)
+        if entree is not None and entree[0] == signature:
+            return entree[1]
+
+        with self._verrou:
+            entree = self._entrees.get(cle)
+            if entree is not None and entree[0] == signature:
+                return entree[1]
+            table = _table_instantane(cle) if journal is None else None
+            if table is not None:
+                # Flat rows go straight to read-only dicts; extras may nest
+                data = ListeLecture(table.to_dicts(figer if table.extras else DictLecture))
+            else:
+                data = figer(charger_json(cle))
+            self._entrees[cle] = (signature, data)
+            return data
+
+    def invalider(self, chemin=None):
+        with self._verrou:
+            self.generation += 1
+            if chemin is None:
+                self._entrees.clear()
+            else:
+                self._entrees.pop(os.path.abspath(chemin), None)
+
+
+depot = DepotJSON()
+
+if os.environ.get("EDT_STOCKAGE", "").lower() == "sqlite":
+    activer_sqlite(os.environ.get("EDT_SQLITE_PATH"))
+
+
+def lire_json(chemin):
+    """Lecture via le dépôt partagé : vue en lecture seule, sans reparsing si le fichier n'a pas changé."""
+    return depot.lire(chemin)
+
+
+def iter_json(chemin):
+    """
+    Enregistrements du fichier lus en flux, sans charger le fichier entier.
+
+    Un fichier journalisé ou géré par SQLite est relu par charger_json, pour
+    voir les mêmes données que lui.
+    """
+    if journal_de(chemin) is not None or _sqlite_gere(chemin) or not os.path.exists(chemin):
+        data = charger_json(chemin)
+        yield from data if isinstance(data, list) else [data]
+        return
+    yield from iter_enregistrements(chemin)
@@ -0,0 +1,188 @@
+"""
+Écritures sûres des fichiers JSON partagés.
+
+Les fenêtres Tk et le backend FastAPI écrivent dans les mêmes fichiers.
+Trois mécanismes évitent fichiers à moitié écrits et mises à jour perdues :
+  - ecrire_atomique / ecrire_flux : écriture (éventuellement en flux et
+    gzip) dans un fichier temporaire du même dossier puis os.replace, un
+    lecteur voit l'ancien ou le nouveau contenu ;
+  - verrou_fichier : verrou consultatif inter-processus sur `<fichier>.lock`
+    (fcntl sous POSIX, msvcrt sous Windows) ;
+  - FileEcriture : un seul thread écrivain par processus. Les écritures en
+    attente sur un même fichier sont regroupées : seule la dernière version
+    est écrite, et tous les appelants concernés sont débloqués.
+"""
+
+import atexit
+import gzip
+import itertools
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from logic.flux_json import est_compresse, format_de, morceaux_json
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+# ================== ECRITURE ATOMIQUE ==================
+
+def ecrire_flux(chemin, morceaux, compresser=False, fsync=True):
+    """Écrit les morceaux (str ou bytes) au fil de l'eau dans un fichier temporaire renommé."""
+    dossier = os.path.dirname(os.path.abspath(chemin))
+    os.makedirs(dossier, exist_ok=True)
+    fd, temporaire = tempfile.mkstemp(dir=dossier, prefix=os.path.basename(chemin) + ".", suffix=".tmp")
+    morceaux = iter(morceaux)
+    premier = next(morceaux, "")
+    binaire = compresser or isinstance(premier, (bytes, bytearray))
+    try:
+        with os.fdopen(fd, "wb" if binaire else "w", **({} if binaire else {"encoding": "utf-8"})) as f:
+            sortie = gzip.GzipFile(fileobj=f, mode="wb", mtime=0) if compresser else f
+            for morceau in itertools.chain([premier], morceaux):
+                if compresser and isinstance(morceau, str):
+                    morceau = morceau.encode("utf-8")
+                sortie.write(morceau)
+            if compresser:
+                sortie.close()
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+        for essai in range(5):
+            try:
+                os.replace(temporaire, chemin)
+                break
+            except PermissionError:
+                # Windows refuses to replace a file another process has open
+                if essai == 4:
+                    raise
+                time.sleep(0.02 * (essai + 1))
+    except BaseException:
+        if os.path.exists(temporaire):
+            os.remove(temporaire)
+        raise
+
+
+def ecrire_atomique(chemin, contenu, fsync=True):
+    """Écrit `contenu` (str ou bytes) dans chemin via un fichier temporaire renommé."""
+    ecrire_flux(chemin, [contenu], fsync=fsync)
+
+
+# ================== VERROUS ==================
+
+@contextmanager
+def verrou_fichier(chemin, partage=False):
+    """Verrou consultatif sur `<chemin>.lock`, exclusif ou partagé (lecteurs, POSIX seulement)."""
+    f = open(chemin + ".lock", "a+b")
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_SH if partage else fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+    finally:
+        f.close()
+
+
+# ================== FILE D'ECRITURE ==================
+
+class _Demande:
+    __slots__ = ("fait", "erreur")
+
+    def __init__(self):
+        self.fait = threading.Event()
+        self.erreur = None
+
+
+class FileEcriture:
+    """Thread écrivain unique ; regroupe les écritures en attente par fichier."""
+
+    def __init__(self, fsync=True):
+        self.fsync = fsync
+        self._condition = threading.Condition()
+        self._en_attente = {}   # chemin -> (producteur de morceaux, rappel après écriture, [demandes])
+        self._en_cours = []     # demandes du lot en cours d'écriture
+        self._thread = None
+
+    def soumettre(self, chemin, data, attendre=True, format="indent", apres=None):
+        """
+        Met data en file pour écriture dans chemin (format : voir logic/flux_json.py).
+
+        `apres` est appelée par le thread écrivain juste après l'écriture,
+        sous le même verrou de fichier (fichiers dérivés, ex. instantané).
+
+        Avec attendre=True l'appelant est bloqué jusqu'à la fin de l'écriture :
+        data est encodée en flux par le thread écrivain, sans copie texte
+        complète en mémoire. Sinon elle est sérialisée tout de suite
+        (l'appelant peut la modifier ensuite).
+        """
+        format = format_de(chemin, format)
+        if attendre:
+            def producteur():
+                return morceaux_json(data, format)
+        else:
+            contenu = "".join(morceaux_json(data, format))
+            def producteur():
+                return [contenu]
+        demande = _Demande()
+        cle = os.path.abspath(chemin)
+        with self._condition:
+            _, _, demandes = self._en_attente.get(cle, (None, None, []))
+            # Only the latest version of a file needs writing
+            self._en_attente[cle] = (producteur, apres, demandes + [demande])
+            self._demarrer()
+            self._condition.notify()
+        if attendre:
+            demande.fait.wait()
+            if demande.erreur is not None:
+                raise demande.erreur
+        return demande
+
+    def vider(self):
+        """Attend que toutes les écritures en file soient faites."""
+        with self._condition:
+            demandes = self._en_cours + [d for _, _, ds in self._en_attente.values() for d in ds]
+        for d in demandes:
+            d.fait.wait()
+
+    def _demarrer(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._boucle, name="ecriture-json", daemon=True)
+            self._thread.start()
+
+    def _boucle(self):
+        while True:
+            with self._condition:
+                while not self._en_attente:
+                    self._condition.wait()
+                lot, self._en_attente = self._en_attente, {}
+                self._en_cours = [d for _, _, ds in lot.values() for d in ds]
+            for chemin, (producteur, apres, demandes) in lot.items():
+                erreur = None
+                try:
+                    with verrou_fichier(chemin):
+                        ecrire_flux(chemin, producteur(), est_compresse(chemin), self.fsync)
+                        if apres is not None:
+                            apres()
+                except Exception as e:
+                    erreur = e
+                for d in demandes:
+                    d.erreur = erreur
+                    d.fait.set()
+
+
+file_ecriture = FileEcriture()
+atexit.register(file_ecriture.vider)
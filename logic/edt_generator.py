@@ -1,5 +1,13 @@
 import json
-from logic.database import charger_json, sauvegarder_json
+import os
+import random
+import time
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import nullcontext
+from logic.database import charger_json, lire_json, sauvegarder_json
+from logic.versions import enregistrer_version
+from logic.profilage import PROFIL_PATH
 
 # ================== CRENEAUX ==================
 
@@ -18,7 +26,7 @@ CRENEAUX_VENDREDI = [
     ("16:00", "17:30")
 ]
 
-from logic.optimization import trier_jours_par_charge
+from logic.optimization import trier_jours_par_charge, ChargeParJour
 
 CRENEAUX_SAMEDI = [
     ("09:00", "10:30"),
@@ -37,128 +45,259 @@ def get_creneaux(jour):
     else:
         return CRENEAUX_SAMEDI
 
-# ================== DETECTION CONFLITS ==================
+# ================== INDEX D'OCCUPATION ==================
+
+class IndexOccupation:
+    """Occupation des salles, enseignants et groupes par (jour, debut).
+
+    Tenu à jour à chaque séance placée, il remplace les parcours complets
+    de l'EDT : chaque test de conflit ou de créneau libre est en O(1).
+    Les compteurs permettent de retirer une séance sans perdre les
+    éventuels doublons déjà présents dans un EDT existant.
+    """
+
+    def __init__(self, edt=None):
+        self.salles = {}
+        self.enseignants = {}
+        self.groupes = {}
+        for s in edt or []:
+            self.ajouter(s)
+
+    @staticmethod
+    def _incrementer(table, cle, valeur, delta):
+        occupants = table.setdefault(cle, {})
+        n = occupants.get(valeur, 0) + delta
+        if n > 0:
+            occupants[valeur] = n
+        else:
+            occupants.pop(valeur, None)
+
+    def _maj(self, seance, delta):
+        cle = (seance["jour"], seance["debut"])
+        self._incrementer(self.salles, cle, seance["salle"], delta)
+        self._incrementer(self.enseignants, cle, seance["enseignant"], delta)
+        self._incrementer(self.groupes, cle, seance["groupe"], delta)
+
+    def ajouter(self, seance):
+        self._maj(seance, 1)
+
+    def retirer(self, seance):
+        self._maj(seance, -1)
+
+    def salle_occupee(self, jour, debut, salle):
+        return salle in self.salles.get((jour, debut), ())
+
+    def enseignant_occupe(self, jour, debut, enseignant):
+        return enseignant in self.enseignants.get((jour, debut), ())
+
+    def groupe_occupe(self, jour, debut, groupe):
+        return groupe in self.groupes.get((jour, debut), ())
+
+# ================== CRENEAUX BLOQUES ==================
+
+AVAILABILITY_PATH = "DONNÉES PRINCIPALES/availability.json"
+
+# chemin -> (objet lire_json, blocages) : re-indexed only when the depot returns a new object,
+# which also covers writes that go to SQLite and leave the JSON file untouched
+_cache_blocages = {}
+
+def nom_enseignant(nom):
+    # Teacher screens store "Dr. Nom  (Spécialité)": keep only the name used in seances.json
+    return " ".join(nom.split("(")[0].split())
+
+def indexer_blocages(blocked_slots):
+    blocages = {"enseignants": set(), "salles": set()}
+    for b in blocked_slots:
+        if b.get("enseignant"):
+            blocages["enseignants"].add((nom_enseignant(b["enseignant"]), b["jour"], b["debut"]))
+        if b.get("salle"):
+            blocages["salles"].add((b["salle"], b["jour"], b["debut"]))
+    return blocages
+
+def charger_blocages(chemin=AVAILABILITY_PATH):
+    """Créneaux bloqués par l'admin, indexés par (enseignant|salle, jour, debut)."""
+    availability = lire_json(chemin)
+
+    # Keyed on the absolute path: the same relative path may be read from another cwd
+    cle = os.path.abspath(chemin)
+    cache = _cache_blocages.get(cle)
+    if cache and cache[0] is availability:
+        return cache[1]
 
-def detecter_conflits(edt, seance):
-    conflits = []
-    
-    # Load availability
     try:
-        availability = charger_json("DONNÉES PRINCIPALES/availability.json")
         blocked = availability.get("blocked_slots", [])
     except:
         blocked = []
 
+    blocages = indexer_blocages(blocked)
+    _cache_blocages[cle] = (availability, blocages)
+    return blocages
+
+# ================== DETECTION CONFLITS ==================
+
+def detecter_conflits(edt, seance, index=None, blocages=None):
+    conflits = []
+
+    if blocages is None:
+        blocages = charger_blocages()
+
     # Check blocked slots for teacher AND rooms
-    for b in blocked:
-        meme_jour = b["jour"] == seance["jour"]
-        meme_creneau = b["debut"] == seance["debut"]
-        
-        if meme_jour and meme_creneau:
-            # Check teacher
-            if b["enseignant"] == seance["enseignant"]:
-                conflits.append("Enseignant indisponible (bloqué par admin)")
-            
-            # Check room
-            if b.get("salle") == seance["salle"]:
-                conflits.append("Salle occupée (bloquée par admin)")
-
-    for s in edt:
-        meme_jour = s["jour"] == seance["jour"]
-        meme_creneau = s["debut"] == seance["debut"]
-
-        if meme_jour and meme_creneau:
-            if s["salle"] == seance["salle"]:
-                conflits.append("Salle occupée")
-
-            if s["enseignant"] == seance["enseignant"]:
-                conflits.append("Enseignant indisponible")
-
-            if s["groupe"] == seance["groupe"]:
-                conflits.append("Groupe en double")
+    jour, debut = seance["jour"], seance["debut"]
+    if (seance["enseignant"], jour, debut) in blocages["enseignants"]:
+        conflits.append("Enseignant indisponible (bloqué par admin)")
+
+    if (seance["salle"], jour, debut) in blocages["salles"]:
+        conflits.append("Salle occupée (bloquée par admin)")
+
+    if index is None:
+        index = IndexOccupation(edt)
+
+    if index.salle_occupee(jour, debut, seance["salle"]):
+        conflits.append("Salle occupée")
+
+    if index.enseignant_occupe(jour, debut, seance["enseignant"]):
+        conflits.append("Enseignant indisponible")
+
+    if index.groupe_occupe(jour, debut, seance["groupe"]):
+        conflits.append("Groupe en double")
 
     return conflits
 
-# ================== TROUVER SALLE ==================
+# ================== CATALOGUE SALLES ==================
 
-def trouver_salle_libre(salles, edt, jour, debut, capacite, type_seance, ressources_requises=None):
-    # Filter candidates by type match
-    candidats = []
-    
+def types_salles_autorises(type_seance, capacite):
     # Determine allowed room types based on session type and capacity needs
-    allowed_types = []
-    
     if type_seance == "Cours":
-        allowed_types = ["Amphi", "Cours"]
+        return ("Amphi", "Cours")
     elif type_seance == "TD":
         if capacite > 50:
-             allowed_types = ["Amphi", "Cours"]
-        else:
-             allowed_types = ["TD"]
+            return ("Amphi", "Cours")
+        return ("TD",)
     elif type_seance == "TP":
         if capacite > 30:
-             allowed_types = ["Amphi", "Cours"]
-        else:
-             allowed_types = ["TP"]
+            return ("Amphi", "Cours")
+        return ("TP",)
     elif type_seance == "Examen":
         # Exams ALWAYS prefer Amphis if possible, otherwise Large Cours rooms
-        allowed_types = ["Amphi", "Cours"]
-    
-    for salle in salles:
-        salle_type = salle.get("type")
-        if salle_type == "Préparation":
-            continue
-            
-        if salle_type in allowed_types:
-             if salle["capacite"] >= capacite:
-                # Check resources
-                if ressources_requises:
-                    salle_resources = salle.get("equipements", [])
-                    if not all(res in salle_resources for res in ressources_requises):
-                        continue
-                candidats.append(salle)
-            
-    # Sort candidates by capacity (fit best)
-    candidats.sort(key=lambda s: s["capacite"])
+        return ("Amphi", "Cours")
+    return ()
+
+class CatalogueSalles:
+    """Tables de salles candidates, construites une fois par génération.
+
+    Les équipements sont codés en masques de bits. Pour chaque couple
+    (types autorisés, masque d'équipements requis) on garde la liste des
+    salles compatibles triée par capacité ; une recherche se limite alors
+    à une bissection sur la capacité puis au parcours de la liste.
+    """
+
+    def __init__(self, salles):
+        self.bits = {}
+        self.salles = []
+        for salle in salles:
+            if salle.get("type") == "Préparation":
+                continue
+            masque = 0
+            for e in salle.get("equipements", []):
+                if e not in self.bits:
+                    self.bits[e] = 1 << len(self.bits)
+                masque |= self.bits[e]
+            self.salles.append((salle, masque))
+        self._tables = {}
+        self._candidats = {}
+
+    def masque(self, ressources):
+        """Masque des ressources demandées, None si l'une est inconnue."""
+        masque = 0
+        for res in ressources or []:
+            bit = self.bits.get(res)
+            if bit is None:
+                return None
+            masque |= bit
+        return masque
+
+    def _table(self, types, masque):
+        cle = (types, masque)
+        table = self._tables.get(cle)
+        if table is None:
+            compatibles = [
+                salle for salle, m in self.salles
+                if salle.get("type") in types and (m & masque) == masque
+            ]
+            # Sort candidates by capacity (fit best)
+            compatibles.sort(key=lambda s: s["capacite"])
+            table = ([s["capacite"] for s in compatibles], [s["nom"] for s in compatibles])
+            self._tables[cle] = table
+        return table
+
+    def candidats(self, type_seance, capacite, ressources_requises=None):
+        """Noms des salles compatibles, de la plus petite à la plus grande."""
+        cle = (type_seance, capacite, tuple(ressources_requises or ()))
+        noms = self._candidats.get(cle)
+        if noms is None:
+            masque = self.masque(ressources_requises)
+            types = types_salles_autorises(type_seance, capacite)
+            if masque is None or not types:
+                noms = ()
+            else:
+                capacites, tous = self._table(types, masque)
+                noms = tuple(tous[bisect_left(capacites, capacite):])
+            self._candidats[cle] = noms
+        return noms
 
-    for salle in candidats:
-        occupee = False
-        for s in edt:
-            if s["jour"] == jour and s["debut"] == debut and s["salle"] == salle["nom"]:
-                occupee = True
-                break
+# ================== TROUVER SALLE ==================
 
-        if not occupee:
-            return salle["nom"]
+def trouver_salle_libre(salles, edt, jour, debut, capacite, type_seance, ressources_requises=None, index=None, catalogue=None, profil=None):
+    if catalogue is None:
+        catalogue = CatalogueSalles(salles)
 
-    return None
+    if index is None:
+        index = IndexOccupation(edt)
+
+    parcourues = 0
+    trouvee = None
+    for nom in catalogue.candidats(type_seance, capacite, ressources_requises):
+        parcourues += 1
+        if not index.salle_occupee(jour, debut, nom):
+            trouvee = nom
+            break
+
+    if profil is not None:
+        profil.compter(type_seance, "salles_parcourues", parcourues)
+    return trouvee
 
 # ================== TROUVER CRENEAU ==================
 
-def trouver_creneau_libre(edt, jour, enseignant, groupe):
+def trouver_creneau_libre(edt, jour, enseignant, groupe, index=None):
+    if index is None:
+        index = IndexOccupation(edt)
+
     for debut, fin in get_creneaux(jour):
-        libre = True
-        for s in edt:
-            if s["jour"] == jour and s["debut"] == debut:
-                if s["enseignant"] == enseignant or s["groupe"] == groupe:
-                    libre = False
-                    break
-        if libre:
-            return debut, fin
+        if index.enseignant_occupe(jour, debut, enseignant):
+            continue
+        if index.groupe_occupe(jour, debut, groupe):
+            continue
+        return debut, fin
 
     return None, None
 
 # ================== PROPOSITION SOLUTION ==================
 
-def proposer_solution(salles, edt, seance):
+def proposer_solution(salles, edt, seance, index=None, catalogue=None, profil=None):
+    if index is None:
+        index = IndexOccupation(edt)
+    if catalogue is None:
+        catalogue = CatalogueSalles(salles)
+
     for jour in JOURS:
         debut, fin = trouver_creneau_libre(
-            edt, jour, seance["enseignant"], seance["groupe"]
+            edt, jour, seance["enseignant"], seance["groupe"], index=index
         )
         if debut:
             salle = trouver_salle_libre(
                 salles, edt, jour, debut, seance["effectif"], seance.get("type", "Cours"),
-                ressources_requises=seance.get("ressources_requises")
+                ressources_requises=seance.get("ressources_requises"),
+                index=index, catalogue=catalogue, profil=profil
             )
             if salle:
                 seance.update({
@@ -170,65 +309,419 @@ def proposer_solution(salles, edt, seance):
                 return seance
     return None
 
-# ================== GENERATION EDT ==================
+# ================== PLACEMENT GLOUTON ==================
 
-def generer_edt():
-    salles = charger_json("DONNÉES PRINCIPALES/salles.json")
-    enseignants = charger_json("DONNÉES PRINCIPALES/enseignants_final.json")
-    groupes = charger_json("DONNÉES PRINCIPALES/groupes.json")
-    seances = charger_json("DONNÉES PRINCIPALES/seances.json")
-    
-    # Sort by priority (Exams first, then Cours, then TD, then TP)
-    seances.sort(key=lambda x: x.get("priorite", 10))
+def placer_seances(seances, salles, blocages, catalogue=None, profil=None):
+    """Passe gloutonne dans l'ordre donné. Retourne (edt, echecs).
 
-    edt = []
+    Avec un ProfilGeneration, compte par type de séance les jours essayés,
+    salles parcourues, vérifications de conflits et appels de repli.
+    """
+    if catalogue is None:
+        catalogue = CatalogueSalles(salles)
 
-    with open("scheduling_errors.txt", "w", encoding='utf-8') as err_file:
-        for seance in seances:
-            placee = False
-            
-            # Sort days to balance load (soft constraint)
-            jours_tries = trier_jours_par_charge(edt, seance["groupe"], JOURS)
+    edt = []
+    echecs = []
+    # Occupation (jour, debut) -> salles / enseignants / groupes, maintained as we place
+    index = IndexOccupation()
+    # Per-group daily load, used to order candidate days
+    charges = ChargeParJour()
+
+    for seance in seances:
+        placee = False
+        type_seance = seance["type"]
+        if profil is not None:
+            profil.compter(type_seance, "seances")
+
+        # Sort days to balance load (soft constraint)
+        jours_tries = trier_jours_par_charge(edt, seance["groupe"], JOURS, charges=charges)
+
+        for jour in jours_tries:
+            if profil is not None:
+                profil.compter(type_seance, "jours_essayes")
+            debut, fin = trouver_creneau_libre(
+                edt, jour, seance["enseignant"], seance["groupe"], index=index
+            )
 
-            for jour in jours_tries:
-                debut, fin = trouver_creneau_libre(
-                    edt, jour, seance["enseignant"], seance["groupe"]
+            if debut:
+                salle = trouver_salle_libre(
+                    salles, edt, jour, debut, seance["effectif"], seance["type"],
+                    ressources_requises=seance.get("ressources_requises"),
+                    index=index, catalogue=catalogue, profil=profil
                 )
 
-                if debut:
-                    salle = trouver_salle_libre(
-                        salles, edt, jour, debut, seance["effectif"], seance["type"],
-                        ressources_requises=seance.get("ressources_requises")
-                    )
-
-                    if salle:
-                        nouvelle_seance = {
-                            "id": seance.get("id"),
-                            "module": seance["module"],
-                            "type": seance["type"],
-                            "enseignant": seance["enseignant"],
-                            "groupe": seance["groupe"],
-                            "jour": jour,
-                            "debut": debut,
-                            "fin": fin,
-                            "salle": salle,
-                            "filiere": seance.get("filiere")
-                        }
-
-                        conflits = detecter_conflits(edt, nouvelle_seance)
-                        if not conflits:
-                            edt.append(nouvelle_seance)
-                            placee = True
-                            break
-
-            if not placee:
-                solution = proposer_solution(salles, edt, seance)
-                if solution:
-                    edt.append(solution)
-                else:
-                    err_file.write(f"SCHEDULING_FAILURE: {seance['module']} ({seance['type']}) Group: {seance['groupe']}\n")
-
-    sauvegarder_json("GESTION EDT/emplois_du_temps.json", edt)
+                if salle:
+                    nouvelle_seance = {
+                        "id": seance.get("id"),
+                        "module": seance["module"],
+                        "type": seance["type"],
+                        "enseignant": seance["enseignant"],
+                        "groupe": seance["groupe"],
+                        "jour": jour,
+                        "debut": debut,
+                        "fin": fin,
+                        "salle": salle,
+                        "filiere": seance.get("filiere")
+                    }
+
+                    if profil is not None:
+                        profil.compter(type_seance, "verifications_conflits")
+                    conflits = detecter_conflits(edt, nouvelle_seance, index=index, blocages=blocages)
+                    if not conflits:
+                        edt.append(nouvelle_seance)
+                        index.ajouter(nouvelle_seance)
+                        charges.ajouter(nouvelle_seance)
+                        placee = True
+                        break
+
+        if not placee:
+            # proposer_solution fills the dict in place: work on a copy so the
+            # same séance list can be replayed (multi-start)
+            if profil is not None:
+                profil.compter(type_seance, "appels_proposer_solution")
+            solution = proposer_solution(salles, edt, dict(seance), index=index, catalogue=catalogue, profil=profil)
+            if solution:
+                edt.append(solution)
+                index.ajouter(solution)
+                charges.ajouter(solution)
+            else:
+                echecs.append(seance)
+                if profil is not None:
+                    profil.compter(type_seance, "echecs")
+
+    return edt, echecs
+
+def evaluer_edt(edt, echecs):
+    """Score à minimiser : (séances non placées, pénalité contraintes souples).
+
+    La pénalité est la somme des carrés des charges journalières de chaque
+    groupe (Cours de filière inclus) : elle favorise les semaines équilibrées.
+    """
+    charges = ChargeParJour(edt)
+    penalite = 0
+    for groupe in charges.toutes:
+        penalite += sum(n * n for n in charges.charge(groupe).values())
+    return (len(echecs), penalite)
+
+# ================== MULTI-START ==================
+
+def ordre_essai(seances, essai, graine=0):
+    """Ordre de placement de l'essai n°essai.
+
+    L'essai 0 garde l'ordre de priorité d'origine ; les suivants mélangent
+    les séances à l'intérieur de chaque niveau de priorité (les Cours de
+    filière restent placés avant les TD/TP) avec une graine dérivée.
+    """
+    if essai == 0:
+        return list(seances)
+    rng = random.Random(graine * 1000003 + essai)
+    cles = {id(s): (s.get("priorite", 10), rng.random()) for s in seances}
+    return sorted(seances, key=lambda s: cles[id(s)])
+
+# Worker-side data, set once per process by _init_worker
+_donnees_essai = {}
+
+def _init_worker(seances, salles, blocages):
+    _donnees_essai["seances"] = seances
+    _donnees_essai["salles"] = salles
+    _donnees_essai["blocages"] = blocages
+    _donnees_essai["catalogue"] = CatalogueSalles(salles)
+
+def _executer_essai(essai, graine):
+    d = _donnees_essai
+    ordre = ordre_essai(d["seances"], essai, graine)
+    edt, echecs = placer_seances(ordre, d["salles"], d["blocages"], catalogue=d["catalogue"])
+    return evaluer_edt(edt, echecs), essai
+
+def placer_multi_start(seances, salles, blocages, nb_essais=None, budget_secondes=None, graine=0, workers=None, profil=None):
+    """Lance plusieurs passes gloutonnes sur un pool de processus et garde la meilleure.
+
+    Les essais sont bornés par nb_essais et/ou budget_secondes (aucun nouvel
+    essai n'est lancé une fois le budget écoulé). Les workers ne renvoient
+    que leur score ; le meilleur essai (plus petit score, puis plus petit
+    numéro) est rejoué localement, donc à nb_essais fixé le résultat ne
+    dépend que de la graine. Retourne (edt, echecs, nb_essais_termines).
+    """
+    workers = workers or os.cpu_count() or 1
+    if nb_essais is None and budget_secondes is None:
+        nb_essais = workers
+    limite = time.monotonic() + budget_secondes if budget_secondes else None
+
+    def continuer(essai):
+        if nb_essais is not None and essai >= nb_essais:
+            return False
+        return limite is None or time.monotonic() < limite
+
+    resultats = []
+    if workers == 1:
+        _init_worker(seances, salles, blocages)
+        essai = 0
+        while continuer(essai):
+            resultats.append(_executer_essai(essai, graine))
+            essai += 1
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(seances, salles, blocages)) as pool:
+            en_cours = set()
+            essai = 0
+            while True:
+                while len(en_cours) < 2 * workers and continuer(essai):
+                    en_cours.add(pool.submit(_executer_essai, essai, graine))
+                    essai += 1
+                if not en_cours:
+                    break
+                termines, en_cours = wait(en_cours, return_when=FIRST_COMPLETED)
+                resultats.extend(f.result() for f in termines)
+
+    # Always at least the default order (essai 0)
+    if not resultats:
+        resultats.append((None, 0))
+    _, meilleur = min(resultats, key=lambda r: (r[0] is None, r[0] or (), r[1]))
+    if profil is not None:
+        profil.compter("multi_start", "essais", len(resultats))
+        profil.compter("multi_start", "meilleur_essai", meilleur)
+    ordre = ordre_essai(seances, meilleur, graine)
+    edt, echecs = placer_seances(ordre, salles, blocages, profil=profil)
+    return edt, echecs, len(resultats)
+
+# ================== REPARATION ==================
+
+class ReparationEDT:
+    """Chaînes d'éjection sur un EDT déjà construit.
+
+    Pour chaque séance non placée on cherche un (jour, créneau, salle) qui
+    n'est gêné que par une seule séance déplaçable ; on l'éjecte, on place
+    la séance, puis on tente de replacer l'éjectée (récursivement, jusqu'à
+    `profondeur`). Chaque mouvement met à jour l'index d'occupation et les
+    charges en O(1) et s'annule de la même manière en cas d'échec.
+    """
+
+    def __init__(self, edt, seances, salles, blocages, catalogue, max_iterations, budget_secondes):
+        self.edt = edt
+        self.blocages = blocages
+        self.catalogue = catalogue
+        self.sources = {s.get("id"): s for s in seances if s.get("id") is not None}
+        self.index = IndexOccupation(edt)
+        self.charges = ChargeParJour(edt)
+        self.par_creneau = {}
+        for p in edt:
+            self.par_creneau.setdefault((p["jour"], p["debut"]), []).append(p)
+        self.iterations = 0
+        self.max_iterations = max_iterations
+        self.limite = time.monotonic() + budget_secondes if budget_secondes else None
+
+    def epuise(self):
+        if self.max_iterations is not None and self.iterations >= self.max_iterations:
+            return True
+        return self.limite is not None and time.monotonic() >= self.limite
+
+    def poser(self, seance, jour, debut, fin, salle):
+        seance.update({"jour": jour, "debut": debut, "fin": fin, "salle": salle})
+        self.index.ajouter(seance)
+        self.charges.ajouter(seance)
+        self.par_creneau.setdefault((jour, debut), []).append(seance)
+
+    def enlever(self, seance):
+        self.index.retirer(seance)
+        self.charges.retirer(seance)
+        self.par_creneau[(seance["jour"], seance["debut"])].remove(seance)
+
+    def _besoins(self, seance):
+        source = self.sources.get(seance.get("id"), seance)
+        effectif = seance.get("effectif", source.get("effectif"))
+        if effectif is None:
+            return None
+        return self.catalogue.candidats(
+            seance["type"], effectif,
+            seance.get("ressources_requises", source.get("ressources_requises"))
+        )
+
+    def _mouvements(self, seance, salles_ok, origine=None):
+        """(cout, jour, debut, fin, salle, gene) triés par charge du groupe.
+
+        Avec `origine` = (jour, debut), les positions les plus proches sont
+        essayées d'abord : même créneau, puis même jour, puis le reste.
+        """
+        ens, grp = seance["enseignant"], seance["groupe"]
+        charge = self.charges.charge(grp)
+        mouvements = []
+        for jour in JOURS:
+            for debut, fin in get_creneaux(jour):
+                if (ens, jour, debut) in self.blocages["enseignants"]:
+                    continue
+                presents = self.par_creneau.get((jour, debut), ())
+                personnes = [p for p in presents if p["enseignant"] == ens or p["groupe"] == grp]
+                if len(personnes) > 1:
+                    continue
+                gene = personnes[0] if personnes else None
+                for salle in salles_ok:
+                    if (salle, jour, debut) in self.blocages["salles"]:
+                        continue
+                    occupant = None
+                    if self.index.salle_occupee(jour, debut, salle):
+                        occupant = next((p for p in presents if p["salle"] == salle), None)
+                        if occupant is None:
+                            continue
+                    if gene is not None and occupant is not None and occupant is not gene:
+                        continue
+                    mouvements.append((charge[jour], jour, debut, fin, salle, gene or occupant))
+
+        def cle(m):
+            ecart = 0
+            if origine is not None:
+                ecart = (m[1] != origine[0]) + ((m[1], m[2]) != origine)
+            return (m[5] is not None, ecart, m[0])
+
+        mouvements.sort(key=cle)
+        return mouvements
+
+    def inserer(self, seance, profondeur, tabou=(), origine=None):
+        salles_ok = self._besoins(seance)
+        if not salles_ok:
+            return False
+        for _, jour, debut, fin, salle, gene in self._mouvements(seance, salles_ok, origine):
+            if self.epuise():
+                return False
+            self.iterations += 1
+            if gene is None:
+                self.poser(seance, jour, debut, fin, salle)
+                return True
+            # Identity, not equality: two identical-looking séances are distinct
+            if profondeur == 0 or any(gene is t for t in tabou) or self._besoins(gene) is None:
+                continue
+            ancien = (gene["jour"], gene["debut"], gene["fin"], gene["salle"])
+            self.enlever(gene)
+            self.poser(seance, jour, debut, fin, salle)
+            if self.inserer(gene, profondeur - 1, tabou + (seance,), origine=ancien[:2]):
+                return True
+            # Undo: the ejected séance could not be re-placed
+            self.enlever(seance)
+            self.poser(gene, *ancien)
+        return False
+
+def reparer_edt(edt, echecs, seances, salles, blocages, catalogue=None,
+                max_iterations=5000, budget_secondes=10.0, profondeur=2, profil=None):
+    """Phase de réparation après la passe gloutonne.
+
+    Tente de placer chaque séance de `echecs` par chaînes d'éjection, dans
+    la limite de `max_iterations` mouvements évalués et de `budget_secondes`.
+    `edt` est modifié en place. Retourne (edt, echecs_restants).
+    """
+    if catalogue is None:
+        catalogue = CatalogueSalles(salles)
+    rep = ReparationEDT(edt, seances, salles, blocages, catalogue, max_iterations, budget_secondes)
+
+    restants = []
+    # A failed insertion leaves the schedule unchanged, so a séance with the
+    # same needs would fail the same way: skip it without searching again
+    sans_issue = set()
+    for seance in echecs:
+        besoins = (seance["type"], seance["enseignant"], seance["groupe"], seance.get("effectif"),
+                   tuple(seance.get("ressources_requises") or ()))
+        if besoins in sans_issue:
+            restants.append(seance)
+            continue
+        nouvelle_seance = {
+            "id": seance.get("id"),
+            "module": seance["module"],
+            "type": seance["type"],
+            "enseignant": seance["enseignant"],
+            "groupe": seance["groupe"],
+            "jour": None,
+            "debut": None,
+            "fin": None,
+            "salle": None,
+            "filiere": seance.get("filiere"),
+            "effectif": seance.get("effectif"),
+        }
+        if not rep.epuise() and rep.inserer(nouvelle_seance, profondeur):
+            del nouvelle_seance["effectif"]
+            edt.append(nouvelle_seance)
+        else:
+            sans_issue.add(besoins)
+            restants.append(seance)
+
+    if profil is not None:
+        profil.compter("reparation", "iterations", rep.iterations)
+        profil.compter("reparation", "seances_reparees", len(echecs) - len(restants))
+    return edt, restants
+
+# ================== GENERATION EDT ==================
+
+def generer_edt(nb_essais=1, budget_secondes=None, graine=0, workers=None,
+                reparation=False, reparation_iterations=5000, reparation_secondes=10.0,
+                profil=None, moteur="glouton", limite_exacte=30.0):
+    """Génère et enregistre l'emploi du temps.
+
+    reparation=True ajoute une recherche locale (chaînes d'éjection) sur les
+    séances non placées ; elle est désactivée par défaut car sur les données
+    actuelles elle ne place rien de plus.
+
+    moteur="exact" utilise le solveur par propagation de contraintes
+    (logic.solveur_exact) limité à `limite_exacte` secondes ; s'il n'aboutit
+    pas, le moteur glouton prend le relais.
+
+    Avec un ProfilGeneration (logic.profilage), chaque phase est chronométrée,
+    les compteurs du placement sont remplis et le profil est écrit dans
+    generation_profile.json.
+    """
+    # No-op phases when profiling is off
+    phase = profil.phase if profil is not None else (lambda nom: nullcontext())
+
+    with phase("chargement"):
+        salles = charger_json("DONNÉES PRINCIPALES/salles.json")
+        enseignants = charger_json("DONNÉES PRINCIPALES/enseignants_final.json")
+        groupes = charger_json("DONNÉES PRINCIPALES/groupes.json")
+        seances = charger_json("DONNÉES PRINCIPALES/seances.json")
+        # Blocked slots are read once per run (and only re-parsed if the file changed)
+        blocages = charger_blocages()
+
+    with phase("tri"):
+        # Sort by priority (Exams first, then Cours, then TD, then TP)
+        seances.sort(key=lambda x: x.get("priorite", 10))
+
+    with phase("placement"):
+        resultat = None
+        if moteur == "exact":
+            from logic.solveur_exact import resoudre_exact
+            resultat = resoudre_exact(seances, salles, blocages, limite_secondes=limite_exacte)
+            if profil is not None:
+                profil.compter("moteur_exact", "abouti" if resultat else "repli_glouton")
+
+        if resultat is not None:
+            edt, echecs = resultat
+        elif nb_essais == 1 and not budget_secondes:
+            edt, echecs = placer_seances(seances, salles, blocages, profil=profil)
+        else:
+            # Multi-start: K perturbed orderings on a process pool, best one kept
+            edt, echecs, _ = placer_multi_start(
+                seances, salles, blocages, nb_essais=nb_essais,
+                budget_secondes=budget_secondes, graine=graine, workers=workers,
+                profil=profil
+            )
+
+    if reparation and echecs:
+        with phase("reparation"):
+            # Local search on the placed schedule to fit the remaining failures
+            edt, echecs = reparer_edt(
+                edt, echecs, seances, salles, blocages,
+                max_iterations=reparation_iterations, budget_secondes=reparation_secondes,
+                profil=profil
+            )
+
+    with phase("sauvegarde"):
+        with open("scheduling_errors.txt", "w", encoding='utf-8') as err_file:
+            for seance in echecs:
+                err_file.write(f"SCHEDULING_FAILURE: {seance['module']} ({seance['type']}) Group: {seance['groupe']}\n")
+
+        sauvegarder_json("GESTION EDT/emplois_du_temps.json", edt)
+        try:
+            enregistrer_version(edt, f"generer_edt ({moteur}, {nb_essais} essai(s))")
+        except Exception as e:
+            print(f"Version not recorded: {e}")
+
+    if profil is not None:
+        profil.sauvegarder(PROFIL_PATH)
     return edt
 
 # ================== EXECUTION ==================
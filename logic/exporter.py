@@ -7,13 +7,17 @@ import pandas as pd
 import matplotlib.pyplot as plt
 
 def exporter_csv(edt, filename):
-    if not edt:
+    # edt may be a list or a stream of records (iter_json): rows are written as they come
+    edt = iter(edt)
+    premier = next(edt, None)
+    if premier is None:
         return False
-    keys = edt[0].keys()
+    keys = premier.keys()
     try:
         with open(filename, 'w', newline='', encoding='utf-8') as f:
             dict_writer = csv.DictWriter(f, fieldnames=keys)
             dict_writer.writeheader()
+            dict_writer.writerow(premier)
             dict_writer.writerows(edt)
         return True
     except Exception as e:
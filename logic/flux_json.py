@@ -0,0 +1,162 @@
+"""
+Écriture et lecture en flux des fichiers JSON volumineux.
+
+Formats d'écriture :
+  - "indent"  : identique octet pour octet à json.dumps(data, indent=4, ensure_ascii=False)
+  - "compact" : JSON sans espaces, environ deux fois plus petit
+  - "lignes"  : JSON Lines, un enregistrement par ligne (listes seulement)
+Un chemin en `.jsonl` (ou `.jsonl.gz`) est toujours écrit en "lignes", un
+chemin en `.gz` est compressé en gzip.
+
+Les listes sont encodées par lots d'enregistrements : écrire un EDT
+de plusieurs dizaines de Mo ne construit jamais la chaîne complète en
+mémoire. iter_enregistrements() relit de même un fichier morceau par
+morceau, quel que soit son format.
+"""
+
+import gzip
+import io
+import json
+import re
+from itertools import islice
+
+FORMATS = ("indent", "compact", "lignes")
+TAILLE_BLOC = 1 << 16   # caractères lus à la fois
+TAILLE_LOT = 500        # enregistrements encodés à la fois
+
+_ESPACES = re.compile(r"[\s,]*")
+
+
+def est_compresse(chemin):
+    return chemin.endswith(".gz")
+
+
+def format_de(chemin, defaut="indent"):
+    """Format imposé par l'extension du chemin, sinon `defaut`."""
+    base = chemin[:-3] if est_compresse(chemin) else chemin
+    return "lignes" if base.endswith(".jsonl") else defaut
+
+
+# ================== ECRITURE ==================
+
+def morceaux_json(data, format="indent"):
+    """Texte JSON de data, produit par morceaux (un par lot d'enregistrements pour une liste)."""
+    if format not in FORMATS:
+        raise ValueError(f"Format JSON inconnu : {format}")
+    if format == "lignes":
+        if not isinstance(data, list):
+            raise TypeError("JSON Lines : une liste d'enregistrements est attendue")
+        yield from morceaux_lignes(data)
+        return
+    if not isinstance(data, list) or not data:
+        if format == "indent":
+            yield json.dumps(data, indent=4, ensure_ascii=False)
+        else:
+            yield json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+        return
+
+    # Records are encoded in batches: a single json.dumps call per batch is much
+    # faster than one per record, and memory stays bounded by the batch size
+    if format == "indent":
+        ouverture, separateur, fermeture = "[\n    ", ",\n    ", "\n]"
+        def encoder(lot):
+            return json.dumps(lot, indent=4, ensure_ascii=False)[6:-2]
+    else:
+        ouverture, separateur, fermeture = "[", ",", "]"
+        def encoder(lot):
+            return json.dumps(lot, ensure_ascii=False, separators=(",", ":"))[1:-1]
+
+    yield ouverture
+    for i in range(0, len(data), TAILLE_LOT):
+        yield (separateur if i else "") + encoder(data[i:i + TAILLE_LOT])
+    yield fermeture
+
+
+def morceaux_lignes(enregistrements):
+    """JSON Lines d'un itérable d'enregistrements (générateur compris), par lots de TAILLE_LOT."""
+    iterateur = iter(enregistrements)
+    while True:
+        lot = list(islice(iterateur, TAILLE_LOT))
+        if not lot:
+            return
+        yield "".join(json.dumps(e, ensure_ascii=False, separators=(",", ":")) + "\n" for e in lot)
+
+
+# ================== LECTURE ==================
+
+def ouvrir(chemin):
+    """Fichier texte utf-8, décompressé à la volée si le chemin finit par .gz."""
+    if est_compresse(chemin):
+        return io.TextIOWrapper(gzip.open(chemin, "rb"), encoding="utf-8")
+    return open(chemin, "r", encoding="utf-8")
+
+
+def _iter_tableau(f, tampon):
+    """Éléments d'un tableau JSON dont le '[' a été consommé, lus bloc par bloc."""
+    decodeur = json.JSONDecoder()
+    pos = 0
+    fin_fichier = False
+    while True:
+        pos = _ESPACES.match(tampon, pos).end()
+        if pos < len(tampon) and tampon[pos] == "]":
+            return
+        try:
+            if pos >= len(tampon):
+                raise ValueError
+            valeur, fin = decodeur.raw_decode(tampon, pos)
+            if fin >= len(tampon) and not fin_fichier:
+                # A number or literal ending with the block may continue in the next one
+                raise ValueError
+        except ValueError:
+            # Record cut at the end of the block: read the next one
+            if fin_fichier:
+                raise ValueError("Tableau JSON incomplet")
+            bloc = f.read(TAILLE_BLOC)
+            fin_fichier = not bloc
+            tampon = tampon[pos:] + bloc
+            pos = 0
+            continue
+        pos = fin
+        yield valeur
+
+
+def iter_enregistrements(chemin):
+    """
+    Enregistrements d'un fichier JSON (tableau), JSON Lines ou .gz, un par un.
+
+    Un fichier JSON qui n'est pas un tableau est renvoyé comme un seul élément.
+    """
+    with ouvrir(chemin) as f:
+        if format_de(chemin) == "lignes":
+            for ligne in f:
+                if ligne.strip():
+                    yield json.loads(ligne)
+            return
+        tableau, contenu = _debut_tableau(f)
+        if tableau:
+            yield from _iter_tableau(f, contenu)
+        else:
+            yield contenu
+
+
+def _debut_tableau(f):
+    """(True, tampon après le '[') pour un tableau, sinon (False, document décodé)."""
+    tampon = f.read(TAILLE_BLOC)
+    debut = len(tampon) - len(tampon.lstrip())
+    if tampon[debut:debut + 1] != "[":
+        return False, json.loads(tampon + f.read())
+    return True, tampon[debut + 1:]
+
+
+def charger_flux(chemin):
+    """
+    Contenu complet d'un fichier JSON, JSON Lines ou .gz.
+
+    Un fichier JSON est lu d'un bloc par json.load (décodeur C) ; les
+    appelants qui parcourent les enregistrements utilisent
+    iter_enregistrements().
+    """
+    if format_de(chemin) == "lignes":
+        return list(iter_enregistrements(chemin))
+    with ouvrir(chemin) as f:
+        return json.load(f)
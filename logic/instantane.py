@@ -0,0 +1,127 @@
+"""
+Instantané binaire de l'emploi du temps, écrit à côté du JSON.
+
+emplois_du_temps.json reste le format d'échange et d'export ; à chaque
+sauvegarde, database.py écrit aussi `emplois_du_temps.bin` : les colonnes
+entières d'une SeanceTable et ses tables de chaînes. Le chargement mappe le
+fichier en mémoire (mmap) et lit les colonnes par memoryview, sans parser
+de JSON. L'instantané n'est utilisé que s'il a été écrit pour la version
+actuelle du JSON (mtime et taille enregistrés dans l'en-tête).
+
+Format (little-endian) :
+    MAGIC (8 octets) | taille de l'en-tête (uint32) | en-tête JSON utf-8
+    | bourrage jusqu'à un multiple de 8 | ids (int64 x n)
+    | une colonne int32 x n par SeanceTable.COLONNES
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from logic.ecriture import ecrire_atomique
+from logic.models import Dictionnaire, SeanceTable
+
+MAGIC = b"EDTBIN01"
+EXTENSION = ".bin"
+
+# Windows cannot replace a file that is still mapped: read it instead
+_MMAP = os.name != "nt"
+
+
+def chemin_instantane(chemin_json):
+    return os.path.splitext(chemin_json)[0] + EXTENSION
+
+
+def _signature(chemin):
+    st = os.stat(chemin)
+    return [st.st_mtime_ns, st.st_size]
+
+
+# ================== ECRITURE ==================
+
+def serialiser(table, source):
+    """Octets de l'instantané d'une SeanceTable ; `source` = signature du JSON."""
+    entete = {
+        "n": len(table),
+        "source": source,
+        "colonnes": list(table.COLONNES),
+        "dictionnaires": {c: table.dictionnaires[c].valeurs for c in table.COLONNES},
+        "ids_autres": [[i, v] for i, v in table.ids_autres.items()],
+        "extras": [[i, v] for i, v in table.extras.items()],
+        "ordres": [[i, list(v)] for i, v in table.ordres.items()],
+    }
+    brut = json.dumps(entete, ensure_ascii=False).encode("utf-8")
+    debut = len(MAGIC) + 4 + len(brut)
+    morceaux = [MAGIC, struct.pack("<I", len(brut)), brut, b"\0" * (-debut % 8)]
+
+    colonnes = [array("q", table.ids)] + [array("i", table.colonnes[c]) for c in table.COLONNES]
+    for col in colonnes:
+        if sys.byteorder != "little":
+            col.byteswap()
+        morceaux.append(col.tobytes())
+    return b"".join(morceaux)
+
+
+def ecrire_instantane(chemin_json, edt):
+    """Écrit l'instantané de `edt` pour le JSON qui vient d'être sauvegardé."""
+    table = SeanceTable.from_dicts(edt)
+    ecrire_atomique(chemin_instantane(chemin_json), serialiser(table, _signature(chemin_json)))
+
+
+# ================== LECTURE ==================
+
+def charger_instantane(chemin_json):
+    """SeanceTable lue depuis l'instantané, ou None s'il manque ou ne correspond plus au JSON."""
+    chemin = chemin_instantane(chemin_json)
+    try:
+        source = _signature(chemin_json)
+        with open(chemin, "rb") as f:
+            if _MMAP:
+                donnees = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                donnees = f.read()
+    except (OSError, ValueError):
+        return None
+
+    vue = memoryview(donnees)
+    if bytes(vue[:len(MAGIC)]) != MAGIC:
+        return None
+    taille, = struct.unpack_from("<I", vue, len(MAGIC))
+    debut = len(MAGIC) + 4
+    entete = json.loads(bytes(vue[debut:debut + taille]).decode("utf-8"))
+    if entete["source"] != source or entete["colonnes"] != list(SeanceTable.COLONNES):
+        return None
+
+    n = entete["n"]
+    dictionnaires = {}
+    for c, valeurs in entete["dictionnaires"].items():
+        if c == "creneau":
+            valeurs = [tuple(v) for v in valeurs]
+        dictionnaires[c] = Dictionnaire(valeurs)
+    table = SeanceTable(dictionnaires)
+
+    pos = debut + taille
+    pos += -pos % 8
+    if sys.byteorder == "little":
+        # Zero copy: the columns are views on the mapped file
+        table.ids = vue[pos:pos + 8 * n].cast("q")
+        pos += 8 * n
+        for c in SeanceTable.COLONNES:
+            table.colonnes[c] = vue[pos:pos + 4 * n].cast("i")
+            pos += 4 * n
+    else:
+        table.ids = array("q", bytes(vue[pos:pos + 8 * n]))
+        table.ids.byteswap()
+        pos += 8 * n
+        for c in SeanceTable.COLONNES:
+            table.colonnes[c] = array("i", bytes(vue[pos:pos + 4 * n]))
+            table.colonnes[c].byteswap()
+            pos += 4 * n
+
+    table.ids_autres = {i: v for i, v in entete["ids_autres"]}
+    table.extras = {i: v for i, v in entete["extras"]}
+    table.ordres = {i: tuple(v) for i, v in entete["ordres"]}
+    return table
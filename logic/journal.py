@@ -0,0 +1,276 @@
+"""
+Journal en ajout seul pour les réservations, demandes et notifications.
+
+Au lieu de relire et réécrire tout le fichier JSON à chaque demande, chaque
+écriture ajoute une ligne JSON à `<fichier>.journal` :
+  {"op": "ajout", "donnees": {...}}              nouvel enregistrement
+  {"op": "maj", "id": ..., "champs": {...}}      mise à jour de champs
+
+L'état courant est le fichier de base rejoué avec le journal ; il est gardé
+en mémoire et seul le nouveau bout du journal est relu ensuite. Au-delà de
+`seuil_compaction` lignes, un thread réécrit la base et vide le journal.
+Les opérations sont idempotentes (ajout d'un id existant = remplacement),
+donc rejouer deux fois une ligne pendant une compaction est sans effet.
+Une ligne coupée par un écrivain interrompu est terminée par l'ajout
+suivant puis ignorée au rejeu.
+Quand le stockage SQLite gère le fichier, il n'y a pas de journal : les
+ajouts et mises à jour vont directement dans la base (voir database.py).
+Ajouts, compaction et réécriture prennent le verrou `<fichier>.journal.lock`
+(exclusif) ; une reconstruction de l'état le prend en partagé.
+Des observateurs (observer()) reçoivent chaque ligne rejouée, de ce
+processus ou d'un autre, et sont prévenus quand l'état est reconstruit :
+un index dérivé se met ainsi à jour sans relire tout le fichier.
+"""
+
+import copy
+import json
+import os
+import threading
+
+from logic.ecriture import verrou_fichier
+
+SEUIL_COMPACTION = 500
+
+
+def _stat(chemin):
+    try:
+        st = os.stat(chemin)
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+
+
+class JournalJSON:
+    """État matérialisé d'un fichier JSON (liste d'enregistrements à "id") + journal."""
+
+    def __init__(self, chemin, lire_base, ecrire_base, signature_base, seuil_compaction=SEUIL_COMPACTION):
+        self.chemin = chemin
+        self.journal = chemin + ".journal"
+        self.compaction = chemin + ".journal.compaction"
+        self._lire_base = lire_base
+        self._ecrire_base = ecrire_base
+        self._signature_base = signature_base
+        self.seuil_compaction = seuil_compaction
+
+        self._verrou = threading.RLock()
+        self._thread = None
+        self._cle = None          # (base, compaction, inode du journal) de l'état en mémoire
+        self._offset = 0          # octets du journal déjà rejoués
+        self._lignes = 0          # lignes en attente de compaction
+        self._etat = []
+        self._index = {}
+        self._observateurs = []
+
+    # ================== OBSERVATEURS ==================
+
+    def observer(self, fonction):
+        """
+        Abonne fonction(op, enregistrement, ancien) aux changements de l'état :
+          - ("ajout", nouvel enregistrement, celui qu'il remplace ou None)
+          - ("maj", enregistrement modifié, copie d'avant la mise à jour)
+          - ("reconstruction", None, None) : état relu en entier
+        Appelée sous le verrou du journal ; les enregistrements sont ceux de
+        l'état interne et ne doivent pas être modifiés.
+        """
+        with self._verrou:
+            self._observateurs.append(fonction)
+
+    def _prevenir(self, op, enregistrement=None, ancien=None):
+        for fonction in self._observateurs:
+            fonction(op, enregistrement, ancien)
+
+    # ================== REJEU ==================
+
+    def _appliquer(self, entree, prevenir=False):
+        op = entree.get("op")
+        if op == "ajout":
+            donnees = entree["donnees"]
+            i = self._index.get(donnees.get("id"))
+            ancien = None
+            if i is None:
+                if donnees.get("id") is not None:
+                    self._index[donnees["id"]] = len(self._etat)
+                self._etat.append(donnees)
+            else:
+                ancien, self._etat[i] = self._etat[i], donnees
+            if prevenir:
+                self._prevenir("ajout", donnees, ancien)
+        elif op == "maj":
+            i = self._index.get(entree.get("id"))
+            if i is not None:
+                ancien = dict(self._etat[i]) if prevenir and self._observateurs else None
+                self._etat[i].update(entree["champs"])
+                if prevenir:
+                    self._prevenir("maj", self._etat[i], ancien)
+
+    def _rejouer(self, chemin, offset=0, prevenir=False):
+        """Applique les lignes complètes de chemin à partir d'offset ; retourne (offset, lignes)."""
+        try:
+            with open(chemin, "rb") as f:
+                f.seek(offset)
+                bloc = f.read()
+        except OSError:
+            return offset, 0
+        # A concurrent writer may be mid-line: stop at the last newline
+        fin = bloc.rfind(b"\n") + 1
+        lignes = 0
+        for ligne in bloc[:fin].splitlines():
+            if not ligne.strip():
+                continue
+            try:
+                entree = json.loads(ligne)
+            except ValueError:
+                # Line torn by a writer that crashed mid-append: skip it
+                print(f"Journal {chemin}: ignored unreadable line")
+                continue
+            self._appliquer(entree, prevenir)
+            lignes += 1
+        return offset + fin, lignes
+
+    def _reconstruire(self):
+        base = self._lire_base(self.chemin) or []
+        self._etat = list(base)
+        self._index = {r["id"]: i for i, r in enumerate(self._etat) if r.get("id") is not None}
+        _, n_compaction = self._rejouer(self.compaction)
+        self._offset, n_journal = self._rejouer(self.journal)
+        self._lignes = n_compaction + n_journal
+        self._prevenir("reconstruction")
+
+    def _synchroniser(self):
+        """Met l'état en mémoire à jour : relit seulement la fin du journal si rien d'autre n'a bougé."""
+        journal = _stat(self.journal)
+        cle = (self._signature_base(self.chemin), _stat(self.compaction), journal and journal[0])
+        if cle != self._cle or (journal and journal[2] < self._offset) or (not journal and self._offset):
+            # Shared lock: no compaction half-done in another process while rebuilding
+            with verrou_fichier(self.journal, partage=True):
+                self._reconstruire()
+                journal = _stat(self.journal)
+                self._cle = (self._signature_base(self.chemin), _stat(self.compaction), journal and journal[0])
+        elif journal and journal[2] > self._offset:
+            self._offset, n = self._rejouer(self.journal, self._offset, prevenir=True)
+            self._lignes += n
+
+    # ================== LECTURE / ECRITURE ==================
+
+    def etat(self):
+        """Copie modifiable de l'état courant (même forme que le fichier JSON)."""
+        with self._verrou:
+            self._synchroniser()
+            return copy.deepcopy(self._etat)
+
+    def lire(self, fonction):
+        """fonction(état courant) sous le verrou, sans copie ; l'état ne doit pas être modifié."""
+        with self._verrou:
+            self._synchroniser()
+            return fonction(self._etat)
+
+    def signature(self):
+        """Change à chaque écriture (base ou journal) ; pour le dépôt en mémoire."""
+        return (self._signature_base(self.chemin), _stat(self.compaction), _stat(self.journal))
+
+    def _ecrire(self, *entrees):
+        # A batch is a single append under the lock
+        lignes = "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in entrees).encode("utf-8")
+        with self._verrou:
+            self._synchroniser()
+            with verrou_fichier(self.journal):
+                with open(self.journal, "a+b") as f:
+                    f.seek(0, os.SEEK_END)
+                    if f.tell():
+                        f.seek(-1, os.SEEK_END)
+                        if f.read(1) != b"\n":
+                            # Close a line left unfinished by a crashed writer
+                            lignes = b"\n" + lignes
+                    f.write(lignes)
+            self._synchroniser()
+            declencher = self._lignes >= self.seuil_compaction
+        if declencher:
+            self.compacter_en_arriere_plan()
+
+    def ajouter(self, enregistrement):
+        self._ecrire({"op": "ajout", "donnees": enregistrement})
+        return enregistrement
+
+    def modifier(self, id_enregistrement, champs):
+        """Met à jour les champs de l'enregistrement `id`. Retourne False s'il n'existe pas."""
+        with self._verrou:
+            self._synchroniser()
+            if id_enregistrement not in self._index:
+                return False
+            self._ecrire({"op": "maj", "id": id_enregistrement, "champs": champs})
+            return True
+
+    def ajouter_lot(self, enregistrements):
+        """Ajoute plusieurs enregistrements en une seule écriture."""
+        if enregistrements:
+            self._ecrire(*({"op": "ajout", "donnees": e} for e in enregistrements))
+        return enregistrements
+
+    def modifier_lot(self, modifications):
+        """
+        Applique {id: champs} en une seule écriture ; les ids inconnus sont ignorés.
+
+        Returns:
+            list: ids effectivement modifiés
+        """
+        with self._verrou:
+            self._synchroniser()
+            ids = [i for i in modifications if i in self._index]
+            if ids:
+                self._ecrire(*({"op": "maj", "id": i, "champs": modifications[i]} for i in ids))
+            return ids
+
+    def remplacer(self, data):
+        """Réécriture complète (sauvegarder_json) : la base devient data, le journal est vidé."""
+        with self._verrou, verrou_fichier(self.journal):
+            self._ecrire_base(self.chemin, data)
+            for chemin in (self.compaction, self.journal):
+                if os.path.exists(chemin):
+                    os.remove(chemin)
+            self._cle = None
+            self._offset = 0
+
+    def transformer(self, fonction):
+        """
+        Réécrit la base avec fonction(état courant), journal vidé, sans
+        qu'aucun ajout concurrent ne se perde entre la lecture et l'écriture.
+        """
+        with self._verrou, verrou_fichier(self.journal):
+            self._reconstruire()
+            resultat = fonction(copy.deepcopy(self._etat))
+            self._ecrire_base(self.chemin, resultat)
+            for chemin in (self.compaction, self.journal):
+                if os.path.exists(chemin):
+                    os.remove(chemin)
+            self._cle = None
+            self._offset = 0
+            return resultat
+
+    # ================== COMPACTION ==================
+
+    def compacter(self):
+        """Reporte le journal dans la base puis le supprime."""
+        with self._verrou, verrou_fichier(self.journal):
+            if not os.path.exists(self.compaction):
+                if not os.path.exists(self.journal):
+                    return
+                # New appends go to a fresh journal while this one is merged
+                os.replace(self.journal, self.compaction)
+            self._reconstruire()
+            self._ecrire_base(self.chemin, self._etat)
+            os.remove(self.compaction)
+            self._cle = None
+            self._offset = 0
+
+    def compacter_en_arriere_plan(self):
+        with self._verrou:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._compacter_silencieux, daemon=True)
+            self._thread.start()
+
+    def _compacter_silencieux(self):
+        try:
+            self.compacter()
+        except Exception as e:
+            print(f"Journal compaction failed for {self.chemin}: {e}")
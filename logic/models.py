@@ -4,10 +4,18 @@ Auteur: Système de Gestion Universitaire
 Date: 2026-01-10
 """
 
-from typing import List, Dict, Any, Optional
+import inspect
+from array import array
+from functools import lru_cache
+from typing import List, Dict, Any, Iterable, Optional
 from datetime import datetime, time
 from enum import Enum
 
+try:
+    import numpy as np
+except ImportError:  # optional: SeanceTable falls back to pure Python
+    np = None
+
 
 # ============================================================================
 # ÉNUMÉRATIONS
@@ -19,6 +27,7 @@ class TypeSalle(Enum):
     COURS = "Cours"
     TD = "TD"
     TP = "TP"
+    PREPARATION = "Préparation"
 
 
 class TypeSeance(Enum):
@@ -45,11 +54,81 @@ class StatutReservation(Enum):
     ANNULEE = "annulée"
 
 
+# ============================================================================
+# CONVERSIONS (MISES EN CACHE)
+# ============================================================================
+
+@lru_cache(maxsize=None)
+def _enum(classe, valeur):
+    """Membre d'énumération pour une valeur brute (une seule recherche par valeur)."""
+    return classe(valeur)
+
+
+@lru_cache(maxsize=None)
+def _heure(valeur: str) -> time:
+    """'HH:MM' -> time, parsé une seule fois par chaîne."""
+    h, m = map(int, valeur.split(':'))
+    return time(h, m)
+
+
+def minutes(heure) -> int:
+    """Minutes depuis minuit pour un time ou une chaîne 'HH:MM' (None si absente)."""
+    if heure is None:
+        return None
+    if isinstance(heure, str):
+        heure = _heure(heure)
+    return heure.hour * 60 + heure.minute
+
+
+class _Modele:
+    """
+    Base des classes du modèle : __slots__ et chargement en lot.
+
+    Les paramètres du constructeur de chaque sous-classe sont lus une fois
+    (inspect.signature) pour que from_records() accepte des dicts JSON avec
+    des clés en trop ou en moins.
+    """
+
+    __slots__ = ()
+    _CHAMPS = ()
+    _REQUIS = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        parametres = list(inspect.signature(cls.__init__).parameters.values())[1:]
+        cls._CHAMPS = tuple(
+            (p.name, None if p.default is inspect.Parameter.empty else p.default)
+            for p in parametres
+        )
+        cls._REQUIS = frozenset(p.name for p in parametres if p.default is inspect.Parameter.empty)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> list:
+        """
+        Construit des instances en lot depuis des dicts JSON.
+
+        Les clés inconnues sont ignorées et les clés absentes prennent la
+        valeur par défaut du constructeur (None si elle n'en a pas). Une
+        erreur levée par le constructeur est propagée.
+        """
+        champs, requis = cls._CHAMPS, cls._REQUIS
+        noms = {nom for nom, _ in champs}
+        objets = []
+        for r in records:
+            cles = r.keys()
+            if requis <= cles <= noms:
+                # Common case: keyword call, missing keys use the real defaults
+                objets.append(cls(**r))
+            else:
+                objets.append(cls(*[r.get(nom, defaut) for nom, defaut in champs]))
+        return objets
+
+
 # ============================================================================
 # CLASSE SALLE
 # ============================================================================
 
-class Salle:
+class Salle(_Modele):
     """
     Représente une salle de cours/TP/TD.
     
@@ -64,13 +143,15 @@ class Salle:
         departement_id (Optional[int]): ID du département (None si partagée)
     """
     
+    __slots__ = ("id", "nom", "capacite", "type", "equipements", "batiment", "etage", "departement_id")
+    
     def __init__(self, id: int, nom: str, capacite: int, type: str,
                  equipements: List[str], batiment: str, etage: int,
                  departement_id: Optional[int] = None):
         self.id = id
         self.nom = nom
         self.capacite = capacite
-        self.type = TypeSalle(type) if isinstance(type, str) else type
+        self.type = _enum(TypeSalle, type) if isinstance(type, str) else type
         self.equipements = equipements
         self.batiment = batiment
         self.etage = etage
@@ -118,7 +199,7 @@ class Salle:
 # CLASSE ENSEIGNANT
 # ============================================================================
 
-class Enseignant:
+class Enseignant(_Modele):
     """
     Représente un enseignant.
     
@@ -132,6 +213,8 @@ class Enseignant:
         filieres (List[int]): Liste des IDs de filières
     """
     
+    __slots__ = ("id", "nom", "specialite", "departement", "email", "modules", "filieres")
+    
     def __init__(self, id: int, nom: str, specialite: str, departement: str,
                  email: str, modules: List[int], filieres: List[int]):
         self.id = id
@@ -182,7 +265,7 @@ class Enseignant:
 # CLASSE GROUPE (FILIÈRE)
 # ============================================================================
 
-class Groupe:
+class Groupe(_Modele):
     """
     Représente un groupe d'étudiants (filière).
     
@@ -198,6 +281,8 @@ class Groupe:
         modules (List[int]): Liste des IDs de modules
     """
     
+    __slots__ = ("id", "code", "nom", "niveau", "annee", "effectif", "departement_id", "duree_totale", "modules")
+    
     def __init__(self, id: int, code: str, nom: str, niveau: str, annee: int,
                  effectif: int, departement_id: int, duree_totale: int,
                  modules: List[int]):
@@ -253,7 +338,7 @@ class Groupe:
 # CLASSE MODULE
 # ============================================================================
 
-class Module:
+class Module(_Modele):
     """
     Représente un module d'enseignement.
     
@@ -272,6 +357,9 @@ class Module:
         specialite_enseignant (str): Spécialité de l'enseignant
     """
     
+    __slots__ = ("id", "code", "nom", "filiere_id", "volume_horaire", "nb_seances_cours", "nb_seances_td",
+                 "nb_seances_tp", "annee", "enseignant_id", "enseignant", "specialite_enseignant")
+    
     def __init__(self, id: int, code: str, nom: str, filiere_id: int,
                  volume_horaire: int, nb_seances_cours: int, nb_seances_td: int,
                  nb_seances_tp: int, annee: int, enseignant_id: int,
@@ -346,7 +434,7 @@ class Module:
 # CLASSE SEANCE
 # ============================================================================
 
-class Seance:
+class Seance(_Modele):
     """
     Représente une séance de cours/TD/TP.
     
@@ -361,8 +449,13 @@ class Seance:
         heure_debut (time): Heure de début
         heure_fin (time): Heure de fin
         semaine (int): Numéro de semaine (optionnel)
+        debut_min (int): Début en minutes depuis minuit
+        fin_min (int): Fin en minutes depuis minuit
     """
     
+    __slots__ = ("id", "module_id", "groupe_id", "enseignant_id", "salle_id", "type", "jour",
+                 "heure_debut", "heure_fin", "semaine", "debut_min", "fin_min")
+    
     def __init__(self, id: int, module_id: int, groupe_id: int,
                  enseignant_id: int, salle_id: int, type: str,
                  jour: str, heure_debut: str, heure_fin: str,
@@ -372,29 +465,20 @@ class Seance:
         self.groupe_id = groupe_id
         self.enseignant_id = enseignant_id
         self.salle_id = salle_id
-        self.type = TypeSeance(type) if isinstance(type, str) else type
-        self.jour = JourSemaine(jour) if isinstance(jour, str) else jour
+        self.type = _enum(TypeSeance, type) if isinstance(type, str) else type
+        self.jour = _enum(JourSemaine, jour) if isinstance(jour, str) else jour
         
-        # Conversion des heures
-        if isinstance(heure_debut, str):
-            h, m = map(int, heure_debut.split(':'))
-            self.heure_debut = time(h, m)
-        else:
-            self.heure_debut = heure_debut
-            
-        if isinstance(heure_fin, str):
-            h, m = map(int, heure_fin.split(':'))
-            self.heure_fin = time(h, m)
-        else:
-            self.heure_fin = heure_fin
+        # Conversion des heures (cache par chaîne)
+        self.heure_debut = _heure(heure_debut) if isinstance(heure_debut, str) else heure_debut
+        self.heure_fin = _heure(heure_fin) if isinstance(heure_fin, str) else heure_fin
+        self.debut_min = minutes(self.heure_debut)
+        self.fin_min = minutes(self.heure_fin)
             
         self.semaine = semaine
     
     def duree_minutes(self) -> int:
         """Retourne la durée de la séance en minutes."""
-        debut = datetime.combine(datetime.today(), self.heure_debut)
-        fin = datetime.combine(datetime.today(), self.heure_fin)
-        return int((fin - debut).total_seconds() / 60)
+        return self.fin_min - self.debut_min
     
     def duree_heures(self) -> float:
         """Retourne la durée de la séance en heures."""
@@ -409,8 +493,8 @@ class Seance:
             if self.semaine != autre_seance.semaine:
                 return False
         
-        return not (self.heure_fin <= autre_seance.heure_debut or 
-                   self.heure_debut >= autre_seance.heure_fin)
+        return not (self.fin_min <= autre_seance.debut_min or 
+                   self.debut_min >= autre_seance.fin_min)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convertit l'objet en dictionnaire."""
@@ -443,7 +527,7 @@ class Seance:
 # CLASSE RESERVATION
 # ============================================================================
 
-class Reservation:
+class Reservation(_Modele):
     """
     Représente une réservation de salle.
     
@@ -458,8 +542,13 @@ class Reservation:
         motif (str): Motif de la réservation
         statut (StatutReservation): Statut de la réservation
         date_creation (datetime): Date de création
+        debut_min (int): Début en minutes depuis minuit
+        fin_min (int): Fin en minutes depuis minuit
     """
     
+    __slots__ = ("id", "salle_id", "enseignant_id", "groupe_id", "jour", "heure_debut", "heure_fin",
+                 "motif", "statut", "date_creation", "debut_min", "fin_min")
+    
     def __init__(self, id: int, salle_id: int, enseignant_id: int,
                  jour: str, heure_debut: str, heure_fin: str, motif: str,
                  groupe_id: Optional[int] = None,
@@ -469,23 +558,16 @@ class Reservation:
         self.salle_id = salle_id
         self.enseignant_id = enseignant_id
         self.groupe_id = groupe_id
-        self.jour = JourSemaine(jour) if isinstance(jour, str) else jour
+        self.jour = _enum(JourSemaine, jour) if isinstance(jour, str) else jour
         
-        # Conversion des heures
-        if isinstance(heure_debut, str):
-            h, m = map(int, heure_debut.split(':'))
-            self.heure_debut = time(h, m)
-        else:
-            self.heure_debut = heure_debut
-            
-        if isinstance(heure_fin, str):
-            h, m = map(int, heure_fin.split(':'))
-            self.heure_fin = time(h, m)
-        else:
-            self.heure_fin = heure_fin
+        # Conversion des heures (cache par chaîne)
+        self.heure_debut = _heure(heure_debut) if isinstance(heure_debut, str) else heure_debut
+        self.heure_fin = _heure(heure_fin) if isinstance(heure_fin, str) else heure_fin
+        self.debut_min = minutes(self.heure_debut)
+        self.fin_min = minutes(self.heure_fin)
             
         self.motif = motif
-        self.statut = StatutReservation(statut) if isinstance(statut, str) else statut
+        self.statut = _enum(StatutReservation, statut) if isinstance(statut, str) else statut
         
         if date_creation:
             self.date_creation = datetime.fromisoformat(date_creation)
@@ -513,8 +595,8 @@ class Reservation:
         if self.jour != seance.jour:
             return False
         
-        return not (self.heure_fin <= seance.heure_debut or 
-                   self.heure_debut >= seance.heure_fin)
+        return not (self.fin_min <= seance.debut_min or 
+                   self.debut_min >= seance.fin_min)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convertit l'objet en dictionnaire."""
@@ -543,6 +625,296 @@ class Reservation:
         return f"Reservation(id={self.id}, salle_id={self.salle_id}, statut='{self.statut.value}')"
 
 
+# ============================================================================
+# TABLE COLONNAIRE DE SÉANCES
+# ============================================================================
+
+_MANQUANT = object()
+
+
+class Dictionnaire:
+    """
+    Table d'interning : valeur <-> code entier (0, 1, 2...).
+
+    Les codes sont indexés par (type, valeur) pour que 1, 1.0 et True restent
+    distincts ; une valeur non hashable reçoit un nouveau code à chaque fois.
+    """
+
+    __slots__ = ("valeurs", "codes")
+
+    def __init__(self, valeurs: Optional[List[Any]] = None):
+        self.valeurs = []
+        self.codes = {}
+        for v in valeurs or []:
+            self.code(v)
+
+    def code(self, valeur: Any) -> int:
+        try:
+            cle = (type(valeur), valeur)
+            c = self.codes.get(cle)
+        except TypeError:
+            # Unhashable (list, dict...): stored as is, not interned
+            self.valeurs.append(valeur)
+            return len(self.valeurs) - 1
+        if c is None:
+            c = self.codes[cle] = len(self.valeurs)
+            self.valeurs.append(valeur)
+        return c
+
+    def cherche(self, valeur: Any) -> Optional[int]:
+        """Code de la valeur, None si elle n'a jamais été codée."""
+        try:
+            return self.codes.get((type(valeur), valeur))
+        except TypeError:
+            for c, v in enumerate(self.valeurs):
+                if type(v) is type(valeur) and v == valeur:
+                    return c
+            return None
+
+    def __len__(self) -> int:
+        return len(self.valeurs)
+
+
+class SeanceTable:
+    """
+    Emploi du temps en colonnes : une colonne d'entiers par attribut.
+
+    Les chaînes répétées (jour, créneau, salle, enseignant, groupe, module,
+    type, filière) sont codées via un Dictionnaire par colonne et stockées
+    dans des array('i') ; l'id est gardé en array('q') quand il est entier.
+    Avec NumPy, filtrer() et compter_par() travaillent directement sur les
+    buffers (np.frombuffer, sans copie) ; sans NumPy, filtrer() passe par
+    des listes de lignes par code, construites à la première requête. Conversion sans perte avec le format dict de
+    emplois_du_temps.json (les clés inconnues sont gardées à part).
+
+    Attributes:
+        colonnes (Dict[str, array]): Codes par colonne (-1 = clé absente)
+        dictionnaires (Dict[str, Dictionnaire]): Valeurs par colonne
+    """
+
+    # creneau codes the (debut, fin) pair
+    COLONNES = ("module", "type", "enseignant", "groupe", "jour", "creneau", "salle", "filiere")
+    # Key order of the records written by generer_edt
+    ORDRE_CLES = ("id", "module", "type", "enseignant", "groupe", "jour", "debut", "fin", "salle", "filiere")
+    ABSENT = -1
+    ID_ABSENT = -(2 ** 63)
+
+    def __init__(self, dictionnaires: Optional[Dict[str, Dictionnaire]] = None):
+        self.dictionnaires = dictionnaires or {c: Dictionnaire() for c in self.COLONNES}
+        self.colonnes = {c: array('i') for c in self.COLONNES}
+        self.ids = array('q')
+        self.ids_autres = {}   # ligne -> id non entier (str, None...)
+        self.extras = {}       # ligne -> {clé inconnue: valeur}
+        self.ordres = {}       # ligne -> ordre des clés s'il diffère de ORDRE_CLES
+        self._inverses = {}    # colonne -> {code: lignes}, sans NumPy
+
+    # ------------------------------------------------------------------
+    # Conversion
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_dicts(cls, seances: List[Dict[str, Any]]) -> 'SeanceTable':
+        """Construit la table depuis le format JSON (liste de dicts)."""
+        table = cls()
+        for s in seances:
+            table.ajouter(s)
+        return table
+
+    def ajouter(self, seance: Dict[str, Any]) -> int:
+        """Ajoute une séance (dict) ; retourne son numéro de ligne."""
+        ligne = len(self.ids)
+        self._inverses.clear()
+        id_ = seance.get("id", _MANQUANT)
+        if type(id_) is int and self.ID_ABSENT < id_ < 2 ** 63:
+            self.ids.append(id_)
+        else:
+            self.ids.append(self.ID_ABSENT)
+            if id_ is not _MANQUANT:
+                self.ids_autres[ligne] = id_
+
+        for c in self.COLONNES:
+            if c == "creneau":
+                if "debut" in seance or "fin" in seance:
+                    valeur = (seance.get("debut"), seance.get("fin"))
+                else:
+                    valeur = _MANQUANT
+            else:
+                valeur = seance.get(c, _MANQUANT)
+            self.colonnes[c].append(self.ABSENT if valeur is _MANQUANT else self.dictionnaires[c].code(valeur))
+
+        cles = tuple(seance)
+        extras = {k: v for k, v in seance.items() if k not in self.ORDRE_CLES}
+        if extras:
+            self.extras[ligne] = extras
+        # Also when only one of debut/fin is present, so the other is not restored as None
+        if cles != tuple(k for k in self.ORDRE_CLES if k in seance) or ("debut" in seance) != ("fin" in seance):
+            self.ordres[ligne] = cles
+        return ligne
+
+    def ligne(self, i: int) -> Dict[str, Any]:
+        """Reconstruit la séance i au format dict."""
+        valeurs = {}
+        id_ = self.ids[i]
+        if id_ != self.ID_ABSENT:
+            valeurs["id"] = id_
+        elif i in self.ids_autres:
+            valeurs["id"] = self.ids_autres[i]
+        for c in self.COLONNES:
+            code = self.colonnes[c][i]
+            if code == self.ABSENT:
+                continue
+            valeur = self.dictionnaires[c].valeurs[code]
+            if c == "creneau":
+                valeurs["debut"], valeurs["fin"] = valeur
+            else:
+                valeurs[c] = valeur
+        if i in self.extras:
+            valeurs.update(self.extras[i])
+        cles = self.ordres.get(i)
+        if cles is None:
+            return valeurs
+        return {k: valeurs[k] for k in cles}
+
+    def to_dicts(self, fabrique=None) -> List[Dict[str, Any]]:
+        """Retourne la table au format JSON (liste de dicts, passés à `fabrique` si donnée)."""
+        complete = not (self.ordres or self.extras or self.ids_autres) and self.ID_ABSENT not in self.ids \
+            and all(self.ABSENT not in col for col in self.colonnes.values())
+        if complete:
+            # Every row has exactly ORDRE_CLES: decode whole columns, build dict literals
+            d = {c: list(map(self.dictionnaires[c].valeurs.__getitem__, self.colonnes[c])) for c in self.COLONNES}
+            lignes = [
+                {"id": i, "module": m, "type": t, "enseignant": e, "groupe": g,
+                 "jour": j, "debut": cr[0], "fin": cr[1], "salle": sl, "filiere": f}
+                for i, m, t, e, g, j, cr, sl, f in zip(
+                    self.ids, d["module"], d["type"], d["enseignant"], d["groupe"],
+                    d["jour"], d["creneau"], d["salle"], d["filiere"]
+                )
+            ]
+        else:
+            lignes = [self.ligne(i) for i in range(len(self))]
+        return lignes if fabrique is None else list(map(fabrique, lignes))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.ligne(i)
+
+    # ------------------------------------------------------------------
+    # Requêtes
+    # ------------------------------------------------------------------
+
+    def _codes(self, colonne: str, valeurs: Any) -> set:
+        """Codes d'une colonne acceptés par un critère (valeur ou liste de valeurs)."""
+        if not isinstance(valeurs, (list, tuple, set, frozenset)):
+            valeurs = [valeurs]
+        if colonne in ("debut", "fin"):
+            pos = 0 if colonne == "debut" else 1
+            acceptees = set(valeurs)
+            return {c for c, v in enumerate(self.dictionnaires["creneau"].valeurs) if v[pos] in acceptees}
+        dictionnaire = self.dictionnaires[colonne]
+        codes = {dictionnaire.cherche(v) for v in valeurs}
+        codes.discard(None)
+        return codes
+
+    def indices(self, **criteres) -> List[int]:
+        """
+        Lignes qui satisfont tous les critères (égalité ou appartenance).
+
+        Example:
+            >>> table.indices(jour="Lundi", debut="09:00")
+            >>> table.indices(salle=["Amphi A", "Amphi B"])
+        """
+        retenues = None
+        for nom, valeurs in criteres.items():
+            colonne = "creneau" if nom in ("debut", "fin") else nom
+            codes = self._codes(nom, valeurs)
+            if not codes:
+                return []
+            if np is not None:
+                col = np.frombuffer(self.colonnes[colonne], dtype=np.int32)
+                masque = np.isin(col, list(codes))
+                retenues = masque if retenues is None else retenues & masque
+            else:
+                # Posting lists per code, built once per column
+                inverse = self._inverse(colonne)
+                lignes = set()
+                for code in codes:
+                    lignes.update(inverse.get(code, ()))
+                retenues = lignes if retenues is None else retenues & lignes
+        if retenues is None:
+            return list(range(len(self)))
+        if np is not None:
+            return np.flatnonzero(retenues).tolist()
+        return sorted(retenues)
+
+    def _inverse(self, colonne: str) -> Dict[int, array]:
+        inverse = self._inverses.get(colonne)
+        if inverse is None:
+            inverse = {}
+            for i, code in enumerate(self.colonnes[colonne]):
+                if code not in inverse:
+                    inverse[code] = array('i')
+                inverse[code].append(i)
+            self._inverses[colonne] = inverse
+        return inverse
+
+    def filtrer(self, **criteres) -> 'SeanceTable':
+        """Sous-table des lignes retenues (dictionnaires partagés)."""
+        return self.sous_table(self.indices(**criteres))
+
+    def sous_table(self, indices: List[int]) -> 'SeanceTable':
+        table = SeanceTable(self.dictionnaires)
+        table.ids = array('q', (self.ids[i] for i in indices))
+        for c in self.COLONNES:
+            col = self.colonnes[c]
+            table.colonnes[c] = array('i', (col[i] for i in indices))
+        for nouvelle, i in enumerate(indices):
+            if i in self.ids_autres:
+                table.ids_autres[nouvelle] = self.ids_autres[i]
+            if i in self.extras:
+                table.extras[nouvelle] = self.extras[i]
+            if i in self.ordres:
+                table.ordres[nouvelle] = self.ordres[i]
+        return table
+
+    def compter_par(self, colonne: str) -> Dict[Any, int]:
+        """Nombre de séances par valeur de la colonne (group-by count)."""
+        dictionnaire = self.dictionnaires["creneau" if colonne in ("debut", "fin") else colonne]
+        col = self.colonnes["creneau" if colonne in ("debut", "fin") else colonne]
+        if np is not None:
+            comptes = np.bincount(np.frombuffer(col, dtype=np.int32) + 1, minlength=len(dictionnaire) + 1)[1:].tolist()
+        else:
+            comptes = [0] * len(dictionnaire)
+            for code in col:
+                if code != self.ABSENT:
+                    comptes[code] += 1
+        resultat = {}
+        for code, n in enumerate(comptes):
+            if n:
+                valeur = dictionnaire.valeurs[code]
+                if colonne in ("debut", "fin"):
+                    valeur = valeur[0 if colonne == "debut" else 1]
+                resultat[valeur] = resultat.get(valeur, 0) + n
+        return resultat
+
+    def grouper_par(self, colonne: str) -> Dict[Any, List[int]]:
+        """Indices des lignes par valeur de la colonne."""
+        dictionnaire = self.dictionnaires[colonne]
+        groupes = {}
+        for i, code in enumerate(self.colonnes[colonne]):
+            if code != self.ABSENT:
+                groupes.setdefault(dictionnaire.valeurs[code], []).append(i)
+        return groupes
+
+    def memoire_octets(self) -> int:
+        """Taille des colonnes (hors dictionnaires, partagés entre tables)."""
+        return self.ids.itemsize * len(self.ids) + sum(
+            col.itemsize * len(col) for col in self.colonnes.values()
+        )
+
+
 # ============================================================================
 # TESTS
 # ============================================================================
@@ -588,4 +960,17 @@ if __name__ == "__main__":
     print(reservation)
     print(f"   Confirmée: {reservation.est_confirmee()}")
     
+    # Test SeanceTable
+    print("\n7. Test SeanceTable:")
+    edt = [
+        {"id": 1, "module": "Algèbre 1", "type": "Cours", "enseignant": "Dr. Hassan Al-Mansouri",
+         "groupe": "GEGM-1", "jour": "Lundi", "debut": "09:00", "fin": "10:30", "salle": "Grande-A1", "filiere": "GEGM-1"},
+        {"id": 2, "module": "Analyse 1", "type": "TD", "enseignant": "Dr. Hassan Al-Mansouri",
+         "groupe": "GEGM-1-G1", "jour": "Mardi", "debut": "10:45", "fin": "12:15", "salle": "TD-01", "filiere": "GEGM-1"},
+    ]
+    table = SeanceTable.from_dicts(edt)
+    print(f"   Aller-retour sans perte: {table.to_dicts() == edt}")
+    print(f"   Lundi 09:00: {table.indices(jour='Lundi', debut='09:00')}")
+    print(f"   Par type: {table.compter_par('type')}")
+    
     print("\n=== Tests terminés ===")
\ No newline at end of file
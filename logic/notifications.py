@@ -0,0 +1,265 @@
+"""
+Boîte de notifications par enseignant.
+
+notifications.json ne fait que grossir au fil du semestre. L'index garde,
+pour chaque enseignant, ses notifications de la plus récente à la plus
+ancienne et son nombre de non lues. Quand le fichier est journalisé,
+l'index observe le journal : chaque ajout ou marquage comme lu (de ce
+processus ou d'un autre) ne met à jour que la notification concernée, et
+l'index n'est reconstruit que si le fichier est relu en entier
+(compaction, archivage, réécriture). Sinon il est reconstruit quand
+lire_json() renvoie un nouvel objet. Un rafraîchissement ne coûte alors
+que la page affichée.
+
+Rétention : les notifications lues de plus de RETENTION_JOURS jours sont
+déplacées dans notifications_archive.jsonl.gz (JSON Lines, gzip en
+ajout), ce qui garde le fichier courant petit. Les non lues restent.
+Un archivage qui ne trouve rien n'est retenté qu'après DELAI_ARCHIVAGE
+secondes ou une croissance notable du fichier.
+"""
+
+import datetime
+import gzip
+import json
+import os
+import threading
+import time
+
+from logic.database import charger_json, depot, figer, journal_de, lire_json, modifier_enregistrements, sauvegarder_json
+from logic.ecriture import verrou_fichier
+from logic.flux_json import iter_enregistrements
+
+NOTIFICATIONS_FICHIER = "GESTION EDT/notifications.json"
+ARCHIVE_FICHIER = "GESTION EDT/notifications_archive.jsonl.gz"
+
+RETENTION_JOURS = 30
+# Above this many notifications, rebuilding the index also archives old read ones
+SEUIL_ARCHIVAGE = 2000
+# After an archiving pass that found nothing, retry only after this delay (seconds)
+# or once the file has grown by SEUIL_ARCHIVAGE // 4 notifications
+DELAI_ARCHIVAGE = 3600
+
+
+class BoiteNotifications:
+    """Index des notifications par enseignant, avec compteurs de non lues."""
+
+    def __init__(self, chemin=NOTIFICATIONS_FICHIER):
+        self.chemin = chemin
+        self._verrou = threading.Lock()
+        self._source = None       # objet lire_json indexé (fichier non journalisé)
+        self._journal = None      # JournalJSON observé
+        self._a_jour = False      # index cohérent avec l'état du journal
+        self._par_enseignant = {}
+        self._non_lues = {}
+        self._par_id = {}
+        self._taille = 0
+        self._archivage = None
+        self._sans_effet = None   # (instant, taille) du dernier archivage qui n'a rien trouvé
+
+    def _index(self):
+        journal = journal_de(self.chemin)
+        if journal is None:
+            notifs = lire_json(self.chemin)
+            if notifs is not self._source:
+                with self._verrou:
+                    if notifs is not self._source:
+                        self._reconstruire(notifs)
+                        self._source = notifs
+        else:
+            if journal is not self._journal:
+                journal.observer(self._evenement)
+                self._journal, self._a_jour = journal, False
+            # Replays only the new journal lines, which reach _evenement one by one
+            journal.lire(self._reconstruire_si_besoin)
+        if self._taille > SEUIL_ARCHIVAGE and self._archivage_utile(self._taille):
+            self.archiver_en_arriere_plan()
+
+    # ================== MISE A JOUR DE L'INDEX ==================
+
+    def _reconstruire_si_besoin(self, etat):
+        with self._verrou:
+            if not self._a_jour:
+                self._reconstruire(etat)
+                self._a_jour = True
+
+    def _reconstruire(self, notifs):
+        """Index complet : au premier accès et quand le fichier a été relu en entier."""
+        par_enseignant, non_lues, par_id = {}, {}, {}
+        for n in notifs:
+            n = figer(n)
+            ens = n.get("enseignant")
+            par_enseignant.setdefault(ens, []).append(n)
+            if not n.get("lu"):
+                non_lues[ens] = non_lues.get(ens, 0) + 1
+            if n.get("id") is not None:
+                par_id[n["id"]] = n
+        for liste in par_enseignant.values():
+            liste.sort(key=lambda x: x.get("date", ""), reverse=True)
+        self._par_enseignant, self._non_lues, self._par_id = par_enseignant, non_lues, par_id
+        self._taille = len(notifs)
+
+    def _evenement(self, op, enregistrement, ancien):
+        """Observateur du journal : ajout ou mise à jour d'une seule notification."""
+        with self._verrou:
+            if op == "reconstruction":
+                self._a_jour = False
+            if not self._a_jour:
+                return
+            n = figer(enregistrement)
+            avant = None if ancien is None else self._par_id.get(ancien.get("id"))
+            if avant is not None and (avant.get("enseignant"), avant.get("date")) == (n.get("enseignant"), n.get("date")):
+                # Read mark and other in-place updates keep the position
+                self._remplacer(avant, n)
+                return
+            self._retirer(avant)
+            self._inserer(n)
+
+    def _remplacer(self, avant, n):
+        ens = n.get("enseignant")
+        liste = self._par_enseignant[ens]
+        for i, autre in enumerate(liste):
+            if autre is avant:
+                liste[i] = n
+                break
+        self._non_lues[ens] = self._non_lues.get(ens, 0) + (not n.get("lu")) - (not avant.get("lu"))
+        self._par_id[n["id"]] = n
+
+    def _inserer(self, n):
+        ens = n.get("enseignant")
+        liste = self._par_enseignant.setdefault(ens, [])
+        # Newest first; equal dates keep file order, as in the full sort
+        date, i = n.get("date", ""), 0
+        while i < len(liste) and liste[i].get("date", "") >= date:
+            i += 1
+        liste.insert(i, n)
+        if not n.get("lu"):
+            self._non_lues[ens] = self._non_lues.get(ens, 0) + 1
+        if n.get("id") is not None:
+            self._par_id[n["id"]] = n
+        self._taille += 1
+
+    def _retirer(self, n):
+        if n is None:
+            return
+        ens = n.get("enseignant")
+        liste = self._par_enseignant.get(ens, [])
+        for i, autre in enumerate(liste):
+            if autre is n:
+                del liste[i]
+                break
+        if not n.get("lu"):
+            self._non_lues[ens] -= 1
+        self._par_id.pop(n.get("id"), None)
+        self._taille -= 1
+
+    # ================== LECTURE ==================
+
+    def nb_non_lues(self, enseignant):
+        self._index()
+        return self._non_lues.get(enseignant, 0)
+
+    def nb_notifications(self, enseignant):
+        self._index()
+        return len(self._par_enseignant.get(enseignant, ()))
+
+    def notifications(self, enseignant, limite=None, decalage=0):
+        """Notifications de l'enseignant, les plus récentes d'abord (vues en lecture seule)."""
+        self._index()
+        liste = self._par_enseignant.get(enseignant, [])
+        return liste[decalage:None if limite is None else decalage + limite]
+
+    # ================== ECRITURE ==================
+
+    def marquer_lues(self, enseignant, ids=None):
+        """
+        Marque comme lues les notifications de l'enseignant (toutes, ou seulement `ids`)
+        en une seule écriture.
+
+        Returns:
+            int: nombre de notifications marquées
+        """
+        self._index()
+        voulus = None if ids is None else {str(i) for i in ids}
+        a_marquer = {
+            n["id"]: {"lu": True}
+            for n in self._par_enseignant.get(enseignant, ())
+            if not n.get("lu") and n.get("id") is not None and (voulus is None or str(n["id"]) in voulus)
+        }
+        if not a_marquer:
+            return 0
+        return len(modifier_enregistrements(self.chemin, a_marquer))
+
+    # ================== RETENTION ==================
+
+    def archiver(self, retention_jours=RETENTION_JOURS, archive=ARCHIVE_FICHIER):
+        """
+        Déplace dans l'archive les notifications lues plus anciennes que retention_jours.
+
+        Returns:
+            int: nombre de notifications archivées
+        """
+        limite = (datetime.datetime.now() - datetime.timedelta(days=retention_jours)).strftime("%Y-%m-%d %H:%M")
+
+        def a_archiver(n):
+            return n.get("lu") and n.get("date", "") < limite
+
+        if not any(a_archiver(n) for n in lire_json(self.chemin)):
+            return 0
+        archivees = []
+
+        def garder(notifs):
+            courantes = []
+            for n in notifs:
+                (archivees if a_archiver(n) else courantes).append(n)
+            if archivees:
+                # Archive first: a crash here duplicates notifications, never loses them
+                with verrou_fichier(archive):
+                    with gzip.open(archive, "at", encoding="utf-8") as f:
+                        for n in archivees:
+                            f.write(json.dumps(n, ensure_ascii=False) + "\n")
+            return courantes
+
+        journal = journal_de(self.chemin)
+        if journal is not None:
+            journal.transformer(garder)
+            depot.invalider(self.chemin)
+        else:
+            courantes = garder(charger_json(self.chemin) or [])
+            if archivees:
+                sauvegarder_json(self.chemin, courantes)
+        return len(archivees)
+
+    def _archivage_utile(self, taille):
+        """Faux si un archivage récent n'a rien trouvé et que le fichier a peu grossi depuis."""
+        if self._sans_effet is None:
+            return True
+        instant, taille_avant = self._sans_effet
+        return (time.monotonic() - instant >= DELAI_ARCHIVAGE
+                or taille - taille_avant >= SEUIL_ARCHIVAGE // 4)
+
+    def archiver_en_arriere_plan(self):
+        with self._verrou:
+            if self._archivage is not None and self._archivage.is_alive():
+                return
+            self._archivage = threading.Thread(target=self._archiver_silencieux, daemon=True)
+            self._archivage.start()
+
+    def _archiver_silencieux(self):
+        try:
+            taille = len(lire_json(self.chemin))
+            archivees = self.archiver()
+        except Exception as e:
+            print(f"Notification archiving failed: {e}")
+            return
+        # Nothing old enough: skip the same full scan on the next index rebuilds
+        self._sans_effet = (time.monotonic(), taille) if not archivees else None
+
+
+def historique_archive(enseignant, archive=ARCHIVE_FICHIER):
+    """Notifications archivées de l'enseignant, lues en flux."""
+    if not os.path.exists(archive):
+        return []
+    return [n for n in iter_enregistrements(archive) if n.get("enseignant") == enseignant]
+
+
+boite = BoiteNotifications()
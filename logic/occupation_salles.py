@@ -0,0 +1,190 @@
+"""
+Occupation des salles en masques de bits, pour les requêtes interactives.
+
+Chaque créneau de la semaine (jour, debut) a un numéro de bit : les 26
+créneaux officiels d'abord, puis tout créneau inconnu rencontré dans les
+données. Chaque salle a un masque par source :
+  - edt          : séances de emplois_du_temps.json
+  - reservations : réservations acceptées
+  - blocages     : créneaux bloqués pour la salle dans availability.json
+Une source n'est relue que si lire_json() en renvoie un nouvel objet,
+c'est-à-dire si son fichier a changé ; seuls les masques des salles dont
+les créneaux ont changé sont mis à jour, et seules les listes de salles
+libres de ces créneaux sont oubliées.
+Les écritures de ce processus sont vues immédiatement (depot.generation) ;
+celles d'un autre processus au plus DELAI_VERIFICATION secondes après, sauf
+avec frais=True (contrôles de conflit avant d'accepter une réservation).
+"La salle X est-elle libre ?" devient un ET de bits, et la liste des salles
+libres d'un créneau est gardée en cache jusqu'au prochain changement.
+"""
+
+import threading
+import time
+
+from logic.database import depot, lire_json
+from logic.edt_generator import JOURS, get_creneaux
+
+EDT_FICHIER = "GESTION EDT/emplois_du_temps.json"
+RESERVATIONS_FICHIER = "GESTION EDT/reservations.json"
+AVAILABILITY_FICHIER = "DONNÉES PRINCIPALES/availability.json"
+SALLES_FICHIER = "DONNÉES PRINCIPALES/salles.json"
+
+COUCHES = ("edt", "reservations", "blocages")
+
+# Files written by another process are re-checked at most this often (seconds)
+DELAI_VERIFICATION = 0.2
+
+
+def _occupations_edt(data):
+    for s in data:
+        yield s["salle"], s["jour"], s["debut"]
+
+
+def _occupations_reservations(data):
+    for r in data:
+        if r.get("statut") == "Acceptée":
+            yield r["salle"], r["jour"], r["debut"]
+
+
+def _occupations_blocages(data):
+    for b in (data or {}).get("blocked_slots", []):
+        if b.get("salle"):
+            yield b["salle"], b["jour"], b["debut"]
+
+
+SOURCES = {
+    "edt": (EDT_FICHIER, _occupations_edt),
+    "reservations": (RESERVATIONS_FICHIER, _occupations_reservations),
+    "blocages": (AVAILABILITY_FICHIER, _occupations_blocages),
+}
+
+
+class OccupationSalles:
+    """Masques d'occupation par salle, tenus à jour à partir des fichiers partagés."""
+
+    def __init__(self):
+        self._verrou = threading.Lock()
+        self.creneaux = []          # bit -> (jour, debut)
+        self._bits = {}             # (jour, debut) -> bit
+        for jour in JOURS:
+            for debut, _ in get_creneaux(jour):
+                self.bit(jour, debut)
+
+        self._sources = {}          # couche -> objet lire_json dont les masques sont issus
+        self._couches = {c: {} for c in COUCHES}   # couche -> {salle: masque}
+        self._paires = {c: set() for c in COUCHES}  # couche -> {(salle, bit)} à l'origine des masques
+        self._salles = None         # objet lire_json de salles.json
+        self._noms = []             # noms des salles, dans l'ordre du fichier
+        self._libres = {}           # (bit, avec blocages) -> (noms des salles libres, même chose en frozenset)
+        self._verifie = (None, 0.0)  # (depot.generation, instant) de la dernière vérification
+
+    def bit(self, jour, debut):
+        """Numéro de bit du créneau (un nouveau bit pour un créneau hors grille)."""
+        cle = (jour, debut)
+        n = self._bits.get(cle)
+        if n is None:
+            n = self._bits[cle] = len(self.creneaux)
+            self.creneaux.append(cle)
+        return n
+
+    # ================== MISE A JOUR ==================
+
+    def _rafraichir(self, frais=False):
+        """Met à jour les couches dont le fichier a changé (frais : sans délai de vérification)."""
+        generation, maintenant = depot.generation, time.monotonic()
+        if not frais and generation == self._verifie[0] and maintenant - self._verifie[1] < DELAI_VERIFICATION:
+            return
+        self._verifie = (generation, maintenant)
+        objets = {c: lire_json(SOURCES[c][0]) for c in COUCHES}
+        salles = lire_json(SALLES_FICHIER)
+        if salles is self._salles and all(objets[c] is self._sources.get(c) for c in COUCHES):
+            return
+        with self._verrou:
+            touches = set()
+            for couche, objet in objets.items():
+                if objet is self._sources.get(couche):
+                    continue
+                paires = {(salle, self.bit(jour, debut)) for salle, jour, debut in SOURCES[couche][1](objet)}
+                changees = paires ^ self._paires[couche]
+                if changees:
+                    # Each changed pair flips exactly one bit; other rooms keep their mask
+                    masques = dict(self._couches[couche])
+                    for salle, bit in changees:
+                        m = masques.get(salle, 0) ^ (1 << bit)
+                        if m:
+                            masques[salle] = m
+                        else:
+                            masques.pop(salle, None)
+                        touches.add(bit)
+                    self._couches[couche] = masques
+                    self._paires[couche] = paires
+                self._sources[couche] = objet
+            if salles is not self._salles:
+                self._noms = [s["nom"] for s in salles]
+                self._salles = salles
+                self._libres = {}
+            elif touches:
+                self._libres = {cle: v for cle, v in self._libres.items() if cle[0] not in touches}
+
+    def invalider(self):
+        with self._verrou:
+            self._sources = {}
+            self._salles = None
+            self._libres = {}
+            self._verifie = (None, 0.0)
+
+    # ================== REQUETES ==================
+
+    def masque(self, salle, blocages=True, frais=False):
+        """Masque des créneaux occupés de la salle."""
+        self._rafraichir(frais)
+        couches = COUCHES if blocages else ("edt", "reservations")
+        m = 0
+        for c in couches:
+            m |= self._couches[c].get(salle, 0)
+        return m
+
+    def salle_libre(self, salle, jour, debut, blocages=True, frais=False):
+        """frais=True relit les fichiers partagés tout de suite (contrôles de conflit)."""
+        return not (self.masque(salle, blocages, frais) >> self.bit(jour, debut)) & 1
+
+    def _salles_libres(self, jour, debut, blocages):
+        self._rafraichir()
+        cle = (self.bit(jour, debut), blocages)
+        libres = self._libres.get(cle)
+        if libres is None:
+            bit = 1 << cle[0]
+            couches = [self._couches[c] for c in (COUCHES if blocages else ("edt", "reservations"))]
+            noms = [nom for nom in self._noms if not any(c.get(nom, 0) & bit for c in couches)]
+            libres = self._libres[cle] = (noms, frozenset(noms))
+        return libres
+
+    def salles_libres(self, jour, debut, blocages=True):
+        """Noms des salles de salles.json libres sur le créneau, dans l'ordre du fichier."""
+        return list(self._salles_libres(jour, debut, blocages)[0])
+
+    def ensemble_libres(self, jour, debut, blocages=True):
+        """Mêmes salles que salles_libres(), en frozenset partagé (tests d'appartenance)."""
+        return self._salles_libres(jour, debut, blocages)[1]
+
+    def salles_occupees(self, jour, debut, blocages=True):
+        """Salles occupées sur le créneau (y compris celles absentes de salles.json)."""
+        self._rafraichir()
+        bit = 1 << self.bit(jour, debut)
+        return {
+            salle
+            for c in (COUCHES if blocages else ("edt", "reservations"))
+            for salle, m in self._couches[c].items() if m & bit
+        }
+
+    def creneaux_libres(self, salle, blocages=True):
+        """Créneaux officiels (jour, debut) où la salle est libre."""
+        m = self.masque(salle, blocages)
+        return [
+            (jour, debut)
+            for jour in JOURS for debut, _ in get_creneaux(jour)
+            if not (m >> self._bits[(jour, debut)]) & 1
+        ]
+
+
+occupation = OccupationSalles()
@@ -60,8 +60,56 @@ def calculer_charge_par_jour(edt, groupe):
             charge[s["jour"]] += 1
     return charge
 
-def trier_jours_par_charge(edt, groupe, jours_disponibles):
-    charge = calculer_charge_par_jour(edt, groupe)
+
+class ChargeParJour:
+    """Charge journalière par groupe, tenue à jour à chaque placement.
+
+    Même règle que calculer_charge_par_jour : un groupe compte ses propres
+    séances plus les Cours de la filière dont il est un sous-groupe
+    (MIPC-G1 hérite des Cours de MIPC). On garde donc deux tables,
+    toutes séances et Cours seuls, et une consultation additionne la
+    ligne du groupe et celles de ses préfixes.
+    """
+
+    def __init__(self, edt=None):
+        self.toutes = {}
+        self.cours = {}
+        for s in edt or []:
+            self.ajouter(s)
+
+    @staticmethod
+    def _incrementer(table, seance, delta):
+        ligne = table.get(seance["groupe"])
+        if ligne is None:
+            ligne = table[seance["groupe"]] = {jour: 0 for jour in JOURS}
+        ligne[seance["jour"]] += delta
+
+    def _maj(self, seance, delta):
+        self._incrementer(self.toutes, seance, delta)
+        if seance["type"] == "Cours":
+            self._incrementer(self.cours, seance, delta)
+
+    def ajouter(self, seance):
+        self._maj(seance, 1)
+
+    def retirer(self, seance):
+        self._maj(seance, -1)
+
+    def charge(self, groupe):
+        charge = dict(self.toutes.get(groupe) or {jour: 0 for jour in JOURS})
+        for i in range(1, len(groupe)):
+            ligne = self.cours.get(groupe[:i])
+            if ligne:
+                for jour, n in ligne.items():
+                    charge[jour] += n
+        return charge
+
+
+def trier_jours_par_charge(edt, groupe, jours_disponibles, charges=None):
+    if charges is not None:
+        charge = charges.charge(groupe)
+    else:
+        charge = calculer_charge_par_jour(edt, groupe)
     # Sort days by load ascending (prefer empty days first)
     return sorted(jours_disponibles, key=lambda j: charge[j])
 
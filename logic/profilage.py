@@ -0,0 +1,55 @@
+"""
+Instrumentation optionnelle du pipeline de génération.
+
+Un ProfilGeneration passé à generer_edt() mesure la durée de chaque phase
+(chargement, tri, placement, réparation, sauvegarde) et compte, par type de
+séance, les jours essayés, les salles parcourues, les vérifications de
+conflits et les appels de repli à proposer_solution.
+"""
+
+import json
+import time
+from contextlib import contextmanager
+
+PROFIL_PATH = "generation_profile.json"
+
+
+class ProfilGeneration:
+    """Durées par phase et compteurs par type de séance."""
+
+    def __init__(self):
+        self.phases = {}
+        self.compteurs = {}
+
+    @contextmanager
+    def phase(self, nom):
+        debut = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[nom] = self.phases.get(nom, 0.0) + time.perf_counter() - debut
+
+    def compter(self, categorie, compteur, n=1):
+        table = self.compteurs.setdefault(categorie, {})
+        table[compteur] = table.get(compteur, 0) + n
+
+    def to_dict(self):
+        return {
+            "phases_secondes": {nom: round(d, 4) for nom, d in self.phases.items()},
+            "total_secondes": round(sum(self.phases.values()), 4),
+            "compteurs": self.compteurs,
+        }
+
+    def sauvegarder(self, chemin=PROFIL_PATH):
+        with open(chemin, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=4, ensure_ascii=False)
+
+    def resume(self):
+        """Lignes lisibles pour le journal de l'interface admin."""
+        lignes = [
+            "Phases : " + ", ".join(f"{nom} {d:.3f}s" for nom, d in self.phases.items())
+        ]
+        for categorie, table in self.compteurs.items():
+            details = ", ".join(f"{cle}={n}" for cle, n in table.items())
+            lignes.append(f"{categorie} : {details}")
+        return lignes
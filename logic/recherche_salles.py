@@ -0,0 +1,118 @@
+"""
+Recherche multicritère de salles libres (écran de réservation enseignant).
+
+IndexSalles est construit une fois par version de salles.json :
+  - équipements codés en masques de bits (noms en minuscules) ;
+  - salles triées par meilleure adéquation : capacité croissante, puis
+    nombre d'équipements en trop, puis ordre du fichier.
+Une recherche fait une bissection sur la capacité minimale puis parcourt
+la liste triée en ne gardant que les salles dont le masque couvre les
+équipements demandés et qui sont libres (ensemble de salles libres du
+créneau, en cache dans logic/occupation_salles.py). Le parcours s'arrête
+dès que la page demandée est remplie.
+"""
+
+from bisect import bisect_left
+
+from logic.database import lire_json
+from logic.occupation_salles import SALLES_FICHIER, occupation
+
+
+class IndexSalles:
+    """Salles triées par capacité, avec masques d'équipements."""
+
+    def __init__(self, salles):
+        self.bits = {}
+        entrees = []
+        for position, salle in enumerate(salles):
+            masque = 0
+            for e in salle.get("equipements", []):
+                e = e.lower()
+                if e not in self.bits:
+                    self.bits[e] = 1 << len(self.bits)
+                masque |= self.bits[e]
+            entrees.append((salle.get("capacite", 0), bin(masque).count("1"), position, salle, masque))
+        entrees.sort(key=lambda e: e[:3])
+        self.capacites = [e[0] for e in entrees]
+        self.salles = [e[3] for e in entrees]
+        self.masques = [e[4] for e in entrees]
+        self.par_nom = {salle["nom"]: salle for salle in salles}
+
+    def masque(self, equipements):
+        """Masque des équipements demandés, None si l'un n'existe dans aucune salle."""
+        masque = 0
+        for e in equipements or []:
+            bit = self.bits.get(e.lower())
+            if bit is None:
+                return None
+            masque |= bit
+        return masque
+
+    def rechercher(self, libres, min_cap=0, equipements=None, types=None, limite=None, decalage=0):
+        """Salles de `libres` (ensemble de noms) qui conviennent, de la mieux ajustée à la moins bien."""
+        requis = self.masque(equipements)
+        if requis is None:
+            return []
+        fin = None if limite is None else decalage + limite
+        resultats = []
+        for i in range(bisect_left(self.capacites, min_cap), len(self.salles)):
+            if self.masques[i] & requis != requis:
+                continue
+            salle = self.salles[i]
+            if salle["nom"] not in libres or (types and salle.get("type") not in types):
+                continue
+            resultats.append(salle)
+            if fin is not None and len(resultats) >= fin:
+                break
+        return resultats[decalage:fin]
+
+
+# salles.json object from lire_json -> its index
+_index = (None, None)
+
+
+def index_salles():
+    """IndexSalles de salles.json, reconstruit seulement quand le fichier change."""
+    global _index
+    salles = lire_json(SALLES_FICHIER)
+    if _index[0] is not salles:
+        _index = (salles, IndexSalles(salles))
+    return _index[1]
+
+
+def salle_equivalente(salle, jour, debut, exclues=()):
+    """
+    Salle libre sur (jour, debut) la plus proche de `salle` : capacité et
+    équipements au moins égaux, même type de préférence.
+
+    Returns:
+        str | None: nom de la salle proposée
+    """
+    index = index_salles()
+    ref = index.par_nom.get(salle)
+    if ref is None:
+        return None
+    libres = occupation.ensemble_libres(jour, debut)
+    exclues = set(exclues) | {salle}
+    for types in ([ref.get("type")], None):
+        proposees = index.rechercher(libres, ref.get("capacite", 0), ref.get("equipements"), types,
+                                     limite=len(exclues) + 1)
+        for s in proposees:
+            if s["nom"] not in exclues:
+                return s["nom"]
+    return None
+
+
+def rechercher_salles_libres(jour, debut, min_cap=0, equipements=None, types=None, limite=None, decalage=0):
+    """
+    Salles libres sur (jour, debut) répondant aux critères, classées par meilleure adéquation.
+
+    Args:
+        min_cap (int): Capacité minimale
+        equipements (list): Équipements requis (sans tenir compte de la casse)
+        types (list): Types de salle acceptés (tous si None)
+        limite (int): Nombre maximal de résultats (top-k), None pour tous
+        decalage (int): Résultats à sauter (pagination)
+    """
+    libres = occupation.ensemble_libres(jour, debut)
+    return index_salles().rechercher(libres, min_cap, equipements, types, limite, decalage)
@@ -0,0 +1,97 @@
+"""
+Replanification incrémentale de l'emploi du temps.
+
+Quand un créneau est bloqué, une réservation acceptée ou une salle retirée,
+seules les séances devenues invalides sont déplacées, au plus près de leur
+position d'origine, au lieu de relancer generer_edt() sur tout l'EDT.
+"""
+
+from logic.database import charger_json, sauvegarder_json
+from logic.edt_generator import CatalogueSalles, ReparationEDT, charger_blocages
+from logic.versions import enregistrer_version
+
+EDT_PATH = "GESTION EDT/emplois_du_temps.json"
+
+# ================== SEANCES IMPACTEES ==================
+
+def blocages_effectifs(blocages, reservations):
+    """Blocages admin + salles tenues par les réservations acceptées."""
+    salles = set(blocages["salles"])
+    for r in reservations:
+        if r.get("statut") == "Acceptée":
+            salles.add((r["salle"], r["jour"], r["debut"]))
+    return {"enseignants": blocages["enseignants"], "salles": salles}
+
+def seances_impactees(edt, blocages, noms_salles):
+    """Séances de l'EDT qui ne respectent plus les blocages ou les salles existantes."""
+    impactees = []
+    for s in edt:
+        jour, debut = s["jour"], s["debut"]
+        if (s["enseignant"], jour, debut) in blocages["enseignants"]:
+            impactees.append(s)
+        elif (s["salle"], jour, debut) in blocages["salles"]:
+            impactees.append(s)
+        elif s["salle"] not in noms_salles:
+            impactees.append(s)
+    return impactees
+
+# ================== REPLANIFICATION ==================
+
+def replanifier_edt(edt, seances, salles, blocages, reservations=(),
+                    max_iterations=2000, budget_secondes=1.0, profondeur=1):
+    """Déplace uniquement les séances cassées, en dérangeant le moins possible.
+
+    Chaque séance cassée est d'abord reposée sur le même créneau dans une
+    autre salle, puis le même jour, puis ailleurs ; une séance voisine peut
+    être décalée (chaîne d'éjection de longueur `profondeur`) si rien n'est
+    libre. Une séance impossible à replacer reste à sa place et est
+    signalée. `edt` est modifié en place.
+
+    Returns:
+        tuple: (edt, deplacees, non_resolues)
+    """
+    bloc = blocages_effectifs(blocages, reservations)
+    cassees = seances_impactees(edt, bloc, {s["nom"] for s in salles})
+    if not cassees:
+        return edt, [], []
+
+    avant = {id(s): (s["jour"], s["debut"], s["salle"]) for s in edt}
+    rep = ReparationEDT(edt, seances, salles, bloc, CatalogueSalles(salles),
+                        max_iterations, budget_secondes)
+
+    non_resolues = []
+    for s in cassees:
+        position = (s["jour"], s["debut"], s["fin"], s["salle"])
+        rep.enlever(s)
+        if not rep.inserer(s, profondeur, origine=position[:2]):
+            # Keep it where it was so nothing else takes its room meanwhile
+            rep.poser(s, *position)
+            non_resolues.append(s)
+
+    deplacees = [s for s in edt if (s["jour"], s["debut"], s["salle"]) != avant[id(s)]]
+    return edt, deplacees, non_resolues
+
+def replanifier_edt_courant(chemin=EDT_PATH):
+    """Relit les données, corrige l'EDT enregistré et ne le réécrit que s'il a changé.
+
+    Returns:
+        tuple: (deplacees, non_resolues)
+    """
+    edt = charger_json(chemin)
+    if not edt:
+        return [], []
+
+    seances = charger_json("DONNÉES PRINCIPALES/seances.json")
+    salles = charger_json("DONNÉES PRINCIPALES/salles.json")
+    reservations = charger_json("GESTION EDT/reservations.json") or []
+
+    edt, deplacees, non_resolues = replanifier_edt(
+        edt, seances, salles, charger_blocages(), reservations
+    )
+    if deplacees:
+        sauvegarder_json(chemin, edt)
+        try:
+            enregistrer_version(edt, f"Replanification ({len(deplacees)} séance(s) déplacée(s))")
+        except Exception as e:
+            print(f"Version not recorded: {e}")
+    return deplacees, non_resolues
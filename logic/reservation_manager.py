@@ -1,127 +1,236 @@
-from logic.database import charger_json, sauvegarder_json
+from logic.database import (charger_json, sauvegarder_json, lire_json,
+                            ajouter_enregistrement, modifier_enregistrement,
+                            ajouter_enregistrements, modifier_enregistrements, stockage_sqlite)
+from logic.occupation_salles import SALLES_FICHIER, occupation
+from logic.recherche_salles import rechercher_salles_libres, salle_equivalente
+from logic.replanification import replanifier_edt_courant
 import uuid
 import json
 import csv
 import os
 import datetime
 
-def salle_disponible(salle, jour, debut):
-    edt = charger_json("GESTION EDT/emplois_du_temps.json")
-    reservations = charger_json("GESTION EDT/reservations.json")
+def _salle_libre(salle, jour, debut, blocages=True, frais=True):
+    # With SQLite active, the indexed query reads the rows the writes just went to.
+    # frais: re-read the shared files now, so another process's acceptance is seen
+    stockage = stockage_sqlite()
+    if stockage is not None:
+        return salle not in stockage.salles_occupees(jour, debut, blocages)
+    return occupation.salle_libre(salle, jour, debut, blocages, frais)
 
-    # Only consider accepted reservations for availability
-    for s in edt:
-        if s["salle"] == salle and s["jour"] == jour and s["debut"] == debut:
-            return False
-            
-    for r in reservations:
-        if r["salle"] == salle and r["jour"] == jour and r["debut"] == debut and r.get("statut") == "Acceptée":
-            return False
-            
-    return True
+def salle_disponible(salle, jour, debut, frais=True):
+    # Timetable and accepted reservations only (blocked slots are not checked here)
+    return _salle_libre(salle, jour, debut, blocages=False, frais=frais)
 
 def ajouter_reservation(reservation):
-    # Set default values
-    reservation["id"] = str(uuid.uuid4())[:8]
-    reservation["statut"] = "En attente"
-    
-    # We still check availability but as "En attente", it doesn't block others yet
-    reservations = charger_json("GESTION EDT/reservations.json")
-    reservations.append(reservation)
-    sauvegarder_json("GESTION EDT/reservations.json", reservations)
-    return True
+    # Same conflict check as batch submission; False if the room is already taken
+    envoyees, _ = ajouter_reservations([reservation])
+    return bool(envoyees)
+
+def _motif_refus(salle, jour, debut):
+    """Raison pour laquelle la salle ne peut pas être attribuée sur le créneau, "" si elle est libre."""
+    if not _salle_libre(salle, jour, debut, blocages=False):
+        return f"La salle {salle} est déjà occupée le {jour} à {debut}."
+    if not _salle_libre(salle, jour, debut, frais=False):
+        return f"Le créneau {jour} à {debut} est bloqué pour la salle {salle}."
+    return ""
 
 def modifier_statut_reservation(resa_id, nouveau_statut):
-    reservations = charger_json("GESTION EDT/reservations.json")
+    """
+    Accepte ou refuse une demande. L'acceptation est refusée si la salle est
+    occupée (EDT, réservation acceptée) ou bloquée sur le créneau.
+
+    Returns:
+        tuple: (True, "") ou (False, motif du refus)
+    """
+    modifiees, conflits = modifier_statut_reservations([resa_id], nouveau_statut)
+    if modifiees:
+        return True, ""
+    return False, next(iter(conflits.values()), "Demande introuvable.")
+
+def _notification_reservation(r, statut):
+    return {
+        "id": str(uuid.uuid4())[:8],
+        "enseignant": r["enseignant"],
+        "salle": r["salle"],
+        "jour": r["jour"],
+        "debut": r["debut"],
+        "statut": statut,
+        "date": datetime.datetime.now().strftime("%Y-%m-%d %H:%M"),
+        "lu": False
+    }
+
+# ================== RESERVATIONS GROUPEES ==================
+
+def ajouter_reservations(reservations):
+    """
+    Soumet plusieurs demandes en une seule écriture.
+
+    Les demandes sur un créneau déjà pris (EDT, réservation acceptée, blocage)
+    ou en double dans le lot sont écartées.
+
+    Returns:
+        tuple: (demandes enregistrées, demandes en conflit)
+    """
+    envoyees, conflits = [], []
+    vus = set()
+    for resa in reservations:
+        cle = (resa["salle"], resa["jour"], resa["debut"])
+        if cle in vus or not _salle_libre(*cle):
+            conflits.append(resa)
+            continue
+        vus.add(cle)
+        resa["id"] = str(uuid.uuid4())[:8]
+        resa["statut"] = "En attente"
+        envoyees.append(resa)
+    ajouter_enregistrements("GESTION EDT/reservations.json", envoyees)
+    return envoyees, conflits
+
+def ajouter_serie_reservations(enseignant, salle, creneaux, motif=""):
+    """
+    Série de demandes pour une salle : un ou plusieurs créneaux (jour, debut) hebdomadaires.
+
+    L'EDT est une semaine type, donc une demande vaut pour toutes les
+    semaines : la série est une demande par créneau, marquée du même
+    identifiant de série.
+    """
+    serie = str(uuid.uuid4())[:8]
+    reservations = [
+        {"enseignant": enseignant, "salle": salle, "jour": jour, "debut": debut, "motif": motif, "serie": serie}
+        for jour, debut in creneaux
+    ]
+    return ajouter_reservations(reservations)
+
+def modifier_statut_reservations(ids, nouveau_statut):
+    """
+    Accepte ou refuse plusieurs demandes : une écriture des réservations et
+    une des notifications pour tout le lot.
+
+    Une demande n'est acceptée que si sa salle est libre et non bloquée, y
+    compris des demandes acceptées plus tôt dans le même lot. L'EDT n'a donc
+    pas à être replanifié : aucune séance n'occupe une salle acceptée.
+
+    Returns:
+        tuple: (ids modifiés, {id refusé pour conflit: motif})
+    """
+    voulus = {str(i) for i in ids}
+    demandes = [r for r in lire_json("GESTION EDT/reservations.json") if str(r.get("id", "")) in voulus]
+
+    retenues, conflits = [], {}
+    prises = set()
+    for r in demandes:
+        if nouveau_statut == "Acceptée":
+            cle = (r["salle"], r["jour"], r["debut"])
+            if cle in prises:
+                conflits[r["id"]] = f"La salle {cle[0]} est déjà attribuée le {cle[1]} à {cle[2]} dans ce lot."
+                continue
+            motif = "" if r.get("statut") == "Acceptée" else _motif_refus(*cle)
+            if motif:
+                conflits[r["id"]] = motif
+                continue
+            prises.add(cle)
+        retenues.append(r)
+
+    modifiees = modifier_enregistrements(
+        "GESTION EDT/reservations.json", {r["id"]: {"statut": nouveau_statut} for r in retenues}
+    )
+    notifications = [_notification_reservation(r, nouveau_statut) for r in retenues]
+    if modifiees and nouveau_statut == "Acceptée":
+        notifications += _marquer_concurrentes(prises, set(modifiees))
+    try:
+        ajouter_enregistrements("GESTION EDT/notifications.json", notifications)
+    except: pass
+    return modifiees, conflits
+
+# ================== CONFLITS ==================
+
+STATUT_CONFLIT = "Conflit"
+
+def _demandes_par_creneau(reservations):
+    """Demandes en attente groupées par (salle, jour, debut) : un seul parcours."""
+    par_creneau = {}
     for r in reservations:
-        if str(r.get("id", "")) == str(resa_id):
-            r["statut"] = nouveau_statut
-            sauvegarder_json("GESTION EDT/reservations.json", reservations)
-            
-            # Log notification
-            try:
-                notifs = charger_json("GESTION EDT/notifications.json") or []
-                notif = {
-                    "id": str(uuid.uuid4())[:8],
-                    "enseignant": r["enseignant"],
-                    "salle": r["salle"],
-                    "jour": r["jour"],
-                    "debut": r["debut"],
-                    "statut": nouveau_statut,
-                    "date": datetime.datetime.now().strftime("%Y-%m-%d %H:%M"),
-                    "lu": False
-                }
-                notifs.append(notif)
-                sauvegarder_json("GESTION EDT/notifications.json", notifs)
-            except: pass
-            
-            return True
-    return False
+        if r.get("statut", "En attente") == "En attente":
+            par_creneau.setdefault((r.get("salle"), r.get("jour"), r.get("debut")), []).append(r)
+    return par_creneau
+
+def _marquer_concurrentes(creneaux, acceptees):
+    """
+    Passe en "Conflit" les demandes en attente sur des créneaux qui viennent
+    d'être attribués, avec une salle équivalente libre proposée.
+
+    Returns:
+        list: notifications à envoyer aux enseignants concernés
+    """
+    stockage = stockage_sqlite()
+    if stockage is not None:
+        par_creneau = {cle: stockage.reservations_salle(*cle, statut="En attente") for cle in creneaux}
+    else:
+        par_creneau = _demandes_par_creneau(lire_json("GESTION EDT/reservations.json"))
+    modifications, notifications = {}, []
+    proposees = {}  # (jour, debut) -> rooms already proposed in this batch
+    for cle in creneaux:
+        for r in par_creneau.get(cle, ()):
+            if r["id"] in acceptees:
+                continue
+            _, jour, debut = cle
+            deja = proposees.setdefault((jour, debut), set())
+            suggestion = salle_equivalente(r["salle"], jour, debut, deja)
+            champs = {"statut": STATUT_CONFLIT}
+            if suggestion:
+                champs["suggestion"] = suggestion
+                deja.add(suggestion)
+            modifications[r["id"]] = champs
+            notif = _notification_reservation(r, STATUT_CONFLIT)
+            if suggestion:
+                notif["suggestion"] = suggestion
+            notifications.append(notif)
+    modifier_enregistrements("GESTION EDT/reservations.json", modifications)
+    return notifications
+
+def analyser_demandes():
+    """
+    Conflits des demandes en attente, pour la vue admin.
+
+    Returns:
+        dict: id -> {"conflit": motif ou "", "suggestion": salle libre équivalente ou None}
+    """
+    analyse = {}
+    proposees = {}
+    for (salle, jour, debut), demandes in _demandes_par_creneau(lire_json("GESTION EDT/reservations.json")).items():
+        # Display only: the cached occupancy is recent enough
+        if not salle_disponible(salle, jour, debut, frais=False):
+            conflit = "Salle occupée"
+        elif len(demandes) > 1:
+            conflit = f"{len(demandes)} demandes concurrentes"
+        else:
+            conflit = ""
+        for k, r in enumerate(demandes):
+            suggestion = None
+            # With competing requests, the first one keeps the room
+            if conflit == "Salle occupée" or k > 0:
+                deja = proposees.setdefault((jour, debut), set())
+                suggestion = salle_equivalente(salle, jour, debut, deja)
+                if suggestion:
+                    deja.add(suggestion)
+            analyse[r.get("id")] = {"conflit": conflit, "suggestion": suggestion}
+    return analyse
+
+def ids_sans_conflit():
+    """Demandes en attente acceptables telles quelles (une par créneau)."""
+    return [i for i, a in analyser_demandes().items() if not a["conflit"]]
 
 def get_salles_disponibles(jour, debut):
-    # Optimization: Load data ONCE
-    all_salles = charger_json("DONNÉES PRINCIPALES/salles.json")
-    edt = charger_json("GESTION EDT/emplois_du_temps.json")
-    reservations = charger_json("GESTION EDT/reservations.json")
-    avail_config = charger_json("DONNÉES PRINCIPALES/availability.json") or {}
-    blocked_slots = avail_config.get("blocked_slots", [])
-
-    # Pre-calculate occupied rooms for this slot
-    occupied_rooms = set()
-    
-    # 1. Check EDT
-    for s in edt:
-        if s["jour"] == jour and s["debut"] == debut:
-             occupied_rooms.add(s["salle"])
-             
-    # 2. Check Reservations
-    for r in reservations:
-        if r["jour"] == jour and r["debut"] == debut and r.get("statut") == "Acceptée":
-             occupied_rooms.add(r["salle"])
-             
-    # 3. Check Blocked Slots
-    for b in blocked_slots:
-        if b["jour"] == jour and b["debut"] == debut:
-            occupied_rooms.add(b.get("salle"))
-
-    available = []
-    for s in all_salles:
-        if s["nom"] not in occupied_rooms:
-            available.append(s["nom"])
-            
-    return available
+    stockage = stockage_sqlite()
+    if stockage is not None:
+        occupees = stockage.salles_occupees(jour, debut)
+        return [s["nom"] for s in lire_json(SALLES_FICHIER) if s["nom"] not in occupees]
+    # Occupancy bitmaps: EDT, accepted reservations and blocked slots, refreshed only on file changes
+    return occupation.salles_libres(jour, debut)
 
-def rechercher_salles(jour, debut, min_cap=0, equipements_requis=None):
-    if equipements_requis is None: equipements_requis = []
-    
-    # Get theoretically available rooms (name list)
-    avail_names = get_salles_disponibles(jour, debut)
-    
-    # Load full room details to check other criteria
-    all_salles = charger_json("DONNÉES PRINCIPALES/salles.json")
-    results = []
-    
-    for s in all_salles:
-        # Check availability
-        if s["nom"] not in avail_names:
-            continue
-            
-        # Check Capacity
-        if s.get("capacite", 0) < min_cap:
-            continue
-            
-        # Check Equipment
-        # Normalize to set for comparison
-        s_equips = set(e.lower() for e in s.get("equipements", []))
-        req_equips = set(e.lower() for e in equipements_requis)
-        
-        # Check if all required are present
-        if not req_equips.issubset(s_equips):
-            continue
-            
-        results.append(s)
-        
-    return results
+def rechercher_salles(jour, debut, min_cap=0, equipements_requis=None, limite=None, decalage=0):
+    # Capacity-sorted index + equipment bitmasks, best fit first; limite/decalage for top-k and paging
+    return rechercher_salles_libres(jour, debut, min_cap, equipements_requis, limite=limite, decalage=decalage)
 
 # Unavailability Request Management
 def ajouter_demande_indisponibilite(demande):
@@ -130,19 +239,16 @@ def ajouter_demande_indisponibilite(demande):
     demande["statut"] = "En attente"
     demande["date_demande"] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
     
-    requests = charger_json("GESTION EDT/unavailability_requests.json") or []
-    requests.append(demande)
-    sauvegarder_json("GESTION EDT/unavailability_requests.json", requests)
+    ajouter_enregistrement("GESTION EDT/unavailability_requests.json", demande)
     return True
 
 def modifier_statut_indisponibilite(request_id, nouveau_statut):
     """Approve or reject unavailability request"""
-    requests = charger_json("GESTION EDT/unavailability_requests.json") or []
+    requests = lire_json("GESTION EDT/unavailability_requests.json") or []
     
     for req in requests:
         if str(req.get("id", "")) == str(request_id):
-            req["statut"] = nouveau_statut
-            sauvegarder_json("GESTION EDT/unavailability_requests.json", requests)
+            modifier_enregistrement("GESTION EDT/unavailability_requests.json", req["id"], {"statut": nouveau_statut})
             
             # If approved, add to availability.json
             if nouveau_statut == "Acceptée":
@@ -159,12 +265,14 @@ def modifier_statut_indisponibilite(request_id, nouveau_statut):
                     }
                     avail["blocked_slots"].append(block)
                     sauvegarder_json("DONNÉES PRINCIPALES/availability.json", avail)
+
+                    # Move only the séances hit by the new block
+                    replanifier_edt_courant()
                 except Exception as e:
                     print(f"Error adding to availability: {e}")
             
             # Send notification to teacher
             try:
-                notifs = charger_json("GESTION EDT/notifications.json") or []
                 notif = {
                     "id": str(uuid.uuid4())[:8],
                     "enseignant": req["enseignant"],
@@ -175,8 +283,7 @@ def modifier_statut_indisponibilite(request_id, nouveau_statut):
                     "date": datetime.datetime.now().strftime("%Y-%m-%d %H:%M"),
                     "lu": False
                 }
-                notifs.append(notif)
-                sauvegarder_json("GESTION EDT/notifications.json", notifs)
+                ajouter_enregistrement("GESTION EDT/notifications.json", notif)
             except: pass
             
             return True
@@ -2,6 +2,8 @@ import json
 import math
 import os
 
+from logic.ecriture import ecrire_atomique, verrou_fichier
+
 # Paths
 MODULES_PATH = "DONNÉES PRINCIPALES/modules (1).json"
 FILIERES_PATH = "DONNÉES PRINCIPALES/filieres (1).json"
@@ -15,8 +17,8 @@ def load_json(path):
         return json.load(f)
 
 def save_json(path, data):
-    with open(path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    with verrou_fichier(path):
+        ecrire_atomique(path, json.dumps(data, ensure_ascii=False, indent=2))
 
 def generate_seances():
     modules = load_json(MODULES_PATH)
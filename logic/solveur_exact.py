@@ -0,0 +1,259 @@
+"""
+Moteur de placement exact : backtracking avec propagation de contraintes.
+
+Alternative au glouton de edt_generator : chaque séance a un domaine de
+valeurs (créneau, salle) codé en bitset (un entier Python de
+nb_creneaux * nb_salles bits). L'affectation d'une séance retire, par
+forward checking, la même salle sur le même créneau à toutes les autres
+séances, et le créneau entier aux séances du même enseignant ou du même
+groupe. La variable suivante est choisie par MRV (plus petit domaine) puis
+par degré. La recherche est itérative et bornée dans le temps ;
+generer_edt(moteur="exact") retombe sur le glouton si elle n'aboutit pas.
+"""
+
+import random
+import time
+
+from logic.edt_generator import JOURS, get_creneaux, types_salles_autorises
+from logic.optimization import ChargeParJour
+
+
+class SolveurExact:
+    """CSP (séance -> créneau x salle) sur domaines bitset."""
+
+    def __init__(self, seances, salles, blocages):
+        self.seances = seances
+        self.creneaux = [(jour, debut, fin) for jour in JOURS for debut, fin in get_creneaux(jour)]
+
+        # Rooms sorted by capacity: lower bits are tried first (best fit)
+        self.salles = sorted(
+            (s for s in salles if s.get("type") != "Préparation"),
+            key=lambda s: s["capacite"]
+        )
+        self.R = len(self.salles)
+        self.masque_creneau = (1 << self.R) - 1
+
+        self.domaines = [self._domaine_initial(s, blocages) for s in seances]
+        self.non_placables = []
+        self._retirer_surcharges()
+
+        # Neighbours: same teacher or same group (whole slot excluded)
+        par_cle = {}
+        for i, s in enumerate(seances):
+            par_cle.setdefault(("e", s["enseignant"]), []).append(i)
+            par_cle.setdefault(("g", s["groupe"]), []).append(i)
+        self.voisins = [set() for _ in seances]
+        for membres in par_cle.values():
+            for i in membres:
+                self.voisins[i].update(membres)
+        for i in range(len(seances)):
+            self.voisins[i].discard(i)
+        self.degre = [len(v) for v in self.voisins]
+        # Final MRV tie-break, reshuffled on restarts
+        self.rang = list(range(len(seances)))
+
+        # Séances that may use each room (same room + slot excluded)
+        self.par_salle = [[] for _ in range(self.R)]
+        for i, d in enumerate(self.domaines):
+            masque = 0
+            for t in range(len(self.creneaux)):
+                masque |= (d >> (t * self.R)) & self.masque_creneau
+            for r in range(self.R):
+                if masque >> r & 1:
+                    self.par_salle[r].append(i)
+
+    def _domaine_initial(self, seance, blocages):
+        types = types_salles_autorises(seance["type"], seance["effectif"])
+        requis = seance.get("ressources_requises") or []
+        compatibles = [
+            r for r, salle in enumerate(self.salles)
+            if salle.get("type") in types and salle["capacite"] >= seance["effectif"]
+            and all(res in salle.get("equipements", []) for res in requis)
+        ]
+        domaine = 0
+        for t, (jour, debut, _) in enumerate(self.creneaux):
+            if (seance["enseignant"], jour, debut) in blocages["enseignants"]:
+                continue
+            for r in compatibles:
+                if (self.salles[r]["nom"], jour, debut) not in blocages["salles"]:
+                    domaine |= 1 << (t * self.R + r)
+        return domaine
+
+    def _retirer_surcharges(self):
+        """Pigeonhole: a teacher or group with more séances than usable slots
+        cannot be fully placed; the extra séances with the lowest priority
+        (highest "priorite" value, then latest in input order) are set aside
+        up front so the search does not prove it by exhaustion.
+
+        "Usable slots" counts every slot open to at least one member, so it is
+        only an upper bound on what the members can share: when they have few
+        slots in common it overestimates, fewer séances are set aside and the
+        search still has to find the remaining impossibilities itself."""
+        for cle in ("enseignant", "groupe"):
+            membres = {}
+            for i, s in enumerate(self.seances):
+                if self.domaines[i]:
+                    membres.setdefault(s[cle], []).append(i)
+            for indices in membres.values():
+                utilisables = 0
+                for t in range(len(self.creneaux)):
+                    bloc = self.masque_creneau << (t * self.R)
+                    if any(self.domaines[i] & bloc for i in indices):
+                        utilisables += 1
+                par_priorite = sorted(indices, key=lambda i: self.seances[i].get("priorite", 10))
+                for i in par_priorite[utilisables:]:
+                    self.domaines[i] = 0
+        for i, d in enumerate(self.domaines):
+            if not d:
+                self.non_placables.append(i)
+
+    def _affecter(self, i, v, actives):
+        """Forward checking. Returns the changes to undo, or None on wipe-out."""
+        R = self.R
+        t, r = divmod(v, R)
+        bit = 1 << v
+        bloc = self.masque_creneau << (t * R)
+        modifs = []
+        domaines = self.domaines
+
+        for j in self.voisins[i]:
+            if j in actives and domaines[j] & bloc:
+                modifs.append((j, domaines[j]))
+                domaines[j] &= ~bloc
+                if not domaines[j]:
+                    self._annuler(modifs)
+                    return None
+        for j in self.par_salle[r]:
+            if j != i and j in actives and domaines[j] & bit:
+                modifs.append((j, domaines[j]))
+                domaines[j] &= ~bit
+                if not domaines[j]:
+                    self._annuler(modifs)
+                    return None
+        return modifs
+
+    def _annuler(self, modifs):
+        for j, ancien in reversed(modifs):
+            self.domaines[j] = ancien
+
+    def _choisir(self, actives):
+        # MRV, ties broken by degree
+        return min(actives, key=lambda i: (self.domaines[i].bit_count(), -self.degre[i], self.rang[i]))
+
+    def _valeurs(self, i, charges):
+        """Values of i: least loaded days first, then slot order, then smallest room."""
+        charge = charges.charge(self.seances[i]["groupe"])
+        d = self.domaines[i]
+        creneaux = sorted(range(len(self.creneaux)), key=lambda t: (charge[self.creneaux[t][0]], t))
+        valeurs = []
+        for t in creneaux:
+            salles = (d >> (t * self.R)) & self.masque_creneau
+            while salles:
+                bas = salles & -salles
+                valeurs.append(t * self.R + bas.bit_length() - 1)
+                salles ^= bas
+        return valeurs
+
+    def _position(self, i, v):
+        # Minimal séance view for ChargeParJour
+        s = self.seances[i]
+        return {"groupe": s["groupe"], "type": s["type"], "jour": self.creneaux[v // self.R][0]}
+
+    def _recherche(self, limite, max_retours):
+        """Une descente. Retourne (affectation | None, interrompue)."""
+        actives = set(range(len(self.seances))) - set(self.non_placables)
+        affectation = {}
+        charges = ChargeParJour()
+        pile = []  # [variable, valeurs, prochaine, modifs]
+        retours = 0
+
+        while actives:
+            i = self._choisir(actives)
+            pile.append([i, self._valeurs(i, charges), 0, None])
+            actives.discard(i)
+
+            # Try the next value of the top frame, backtracking when exhausted
+            while pile:
+                if time.monotonic() > limite or retours > max_retours:
+                    return None, True
+                cadre = pile[-1]
+                var = cadre[0]
+                if cadre[3] is not None:
+                    self._annuler(cadre[3])
+                    charges.retirer(self._position(var, affectation.pop(var)))
+                    cadre[3] = None
+                    retours += 1
+                if cadre[2] >= len(cadre[1]):
+                    pile.pop()
+                    actives.add(var)
+                    continue
+                v = cadre[1][cadre[2]]
+                cadre[2] += 1
+                modifs = self._affecter(var, v, actives)
+                if modifs is not None:
+                    cadre[3] = modifs
+                    affectation[var] = v
+                    charges.ajouter(self._position(var, v))
+                    break
+            if not pile:
+                return None, False
+
+        return affectation, False
+
+    def resoudre(self, limite_secondes=30.0, graine=0):
+        """Retourne {indice: valeur} si une affectation complète est trouvée, sinon None.
+
+        Chronological backtracking gets stuck on an early bad choice, so the
+        search restarts with a doubling backtrack cutoff and a reshuffled
+        MRV tie-break (first descent deterministic).
+        """
+        limite = time.monotonic() + limite_secondes
+        initiaux = list(self.domaines)
+        rng = random.Random(graine)
+        max_retours = 1000
+        essai = 0
+        while time.monotonic() < limite:
+            if essai:
+                ordre = list(range(len(self.seances)))
+                rng.shuffle(ordre)
+                self.rang = ordre
+            affectation, interrompue = self._recherche(limite, max_retours)
+            self.domaines = list(initiaux)
+            if affectation is not None or not interrompue:
+                # Found, or the whole tree was exhausted (infeasible)
+                return affectation
+            max_retours *= 2
+            essai += 1
+        return None
+
+    def construire_edt(self, affectation):
+        """Même format que la passe gloutonne : (edt, echecs)."""
+        edt, echecs = [], []
+        for i, s in enumerate(self.seances):
+            if i not in affectation:
+                echecs.append(s)
+                continue
+            t, r = divmod(affectation[i], self.R)
+            jour, debut, fin = self.creneaux[t]
+            edt.append({
+                "id": s.get("id"),
+                "module": s["module"],
+                "type": s["type"],
+                "enseignant": s["enseignant"],
+                "groupe": s["groupe"],
+                "jour": jour,
+                "debut": debut,
+                "fin": fin,
+                "salle": self.salles[r]["nom"],
+                "filiere": s.get("filiere")
+            })
+        return edt, echecs
+
+
+def resoudre_exact(seances, salles, blocages, limite_secondes=30.0, graine=0):
+    """Placement exact. Retourne (edt, echecs) ou None si aucune solution n'est trouvée."""
+    solveur = SolveurExact(seances, salles, blocages)
+    affectation = solveur.resoudre(limite_secondes, graine)
+    if affectation is None:
+        return None
+    return solveur.construire_edt(affectation)
@@ -1,11 +1,21 @@
 import json
-from logic.database import charger_json
+from logic.database import lire_json
+from logic.models import SeanceTable
+
+# lire_json returns the same object while the file is unchanged
+_table_cache = (None, None)
+
+def _table_edt(edt):
+    global _table_cache
+    if _table_cache[0] is not edt:
+        _table_cache = (edt, SeanceTable.from_dicts(edt))
+    return _table_cache[1]
 
 def get_advanced_stats():
     try:
-        edt = charger_json("GESTION EDT/emplois_du_temps.json")
-        reservations = charger_json("GESTION EDT/reservations.json")
-        salles = charger_json("DONNÉES PRINCIPALES/salles.json")
+        edt = lire_json("GESTION EDT/emplois_du_temps.json")
+        reservations = lire_json("GESTION EDT/reservations.json")
+        salles = lire_json("DONNÉES PRINCIPALES/salles.json")
         
         # 1. Occupation par jour
         repartition_jou = {"Lundi": 0, "Mardi": 0, "Mercredi": 0, "Jeudi": 0, "Vendredi": 0, "Samedi": 0}
@@ -16,18 +26,13 @@ def get_advanced_stats():
         # 3. Taux d'occupation par salle
         salle_stats = {s['nom']: 0 for s in salles}
         
-        for s in edt:
-            # Jour
-            j = s.get('jour')
-            if j in repartition_jou: repartition_jou[j] += 1
-            
-            # Plage
-            p = s.get('debut')
-            plages[p] = plages.get(p, 0) + 1
-            
-            # Salle
-            sl = s.get('salle')
-            if sl in salle_stats: salle_stats[sl] += 1
+        # Group-by counts on the columnar table instead of a pass over the dicts
+        table = _table_edt(edt)
+        for j, n in table.compter_par('jour').items():
+            if j in repartition_jou: repartition_jou[j] += n
+        plages.update(table.compter_par('debut'))
+        for sl, n in table.compter_par('salle').items():
+            if sl in salle_stats: salle_stats[sl] += n
             
         # Add reservations to demand
         for r in reservations:
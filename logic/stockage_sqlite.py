@@ -0,0 +1,303 @@
+"""
+Stockage SQLite optionnel derrière charger_json / sauvegarder_json.
+
+Activé par activer_sqlite() ou par la variable d'environnement
+EDT_STOCKAGE=sqlite. Les fichiers de GESTION EDT/ et availability.json sont
+alors lus et écrits dans une base SQLite au lieu du JSON :
+  - emplois_du_temps.json  -> table seances      (index jour/debut/salle, groupe, enseignant)
+  - reservations.json      -> table reservations (index salle/jour/debut/statut)
+  - availability.json      -> table blocages     (index jour/debut, enseignant)
+  - autres fichiers gérés  -> table documents    (contenu JSON brut)
+
+Chaque ligne garde l'enregistrement complet en JSON (colonne donnees) pour
+un aller-retour sans perte ; les colonnes indexées servent aux requêtes
+(salles occupées sur un créneau, séances d'un enseignant ou d'un groupe...).
+ajouter() et modifier() n'écrivent que les lignes concernées : ce sont
+eux qui remplacent le journal d'ajouts (logic/journal.py) quand la base
+gère le fichier. importer_json() remplit la base depuis les fichiers,
+exporter_json() réécrit les fichiers depuis la base.
+
+Usage:
+    python -m logic.stockage_sqlite importer
+    python -m logic.stockage_sqlite exporter
+"""
+
+import json
+import os
+import sqlite3
+import sys
+from contextlib import contextmanager
+
+SQLITE_PATH = "GESTION EDT/edt.sqlite3"
+
+EDT_FICHIER = "GESTION EDT/emplois_du_temps.json"
+RESERVATIONS_FICHIER = "GESTION EDT/reservations.json"
+AVAILABILITY_FICHIER = "DONNÉES PRINCIPALES/availability.json"
+FICHIERS_GERES = [
+    EDT_FICHIER,
+    RESERVATIONS_FICHIER,
+    AVAILABILITY_FICHIER,
+    "GESTION EDT/notifications.json",
+    "GESTION EDT/unavailability_requests.json",
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS seances (
+    position INTEGER PRIMARY KEY,
+    jour TEXT, debut TEXT, salle TEXT, groupe TEXT, enseignant TEXT,
+    donnees TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_seances_creneau ON seances (jour, debut, salle);
+CREATE INDEX IF NOT EXISTS idx_seances_groupe ON seances (groupe);
+CREATE INDEX IF NOT EXISTS idx_seances_enseignant ON seances (enseignant);
+
+CREATE TABLE IF NOT EXISTS reservations (
+    position INTEGER PRIMARY KEY,
+    salle TEXT, jour TEXT, debut TEXT, statut TEXT, enseignant TEXT,
+    donnees TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_reservations_creneau ON reservations (salle, jour, debut, statut);
+
+CREATE TABLE IF NOT EXISTS blocages (
+    position INTEGER PRIMARY KEY,
+    jour TEXT, debut TEXT, enseignant TEXT, salle TEXT,
+    donnees TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_blocages_creneau ON blocages (jour, debut);
+CREATE INDEX IF NOT EXISTS idx_blocages_enseignant ON blocages (enseignant);
+
+CREATE TABLE IF NOT EXISTS documents (
+    fichier TEXT PRIMARY KEY,
+    contenu TEXT NOT NULL
+);
+"""
+
+# fichier -> (table, colonnes indexées extraites de chaque enregistrement)
+TABLES = {
+    EDT_FICHIER: ("seances", ("jour", "debut", "salle", "groupe", "enseignant")),
+    RESERVATIONS_FICHIER: ("reservations", ("salle", "jour", "debut", "statut", "enseignant")),
+    AVAILABILITY_FICHIER: ("blocages", ("jour", "debut", "enseignant", "salle")),
+}
+
+
+def _cle(chemin):
+    """'.../GESTION EDT/reservations.json' -> 'GESTION EDT/reservations.json'."""
+    parties = os.path.normpath(chemin).split(os.sep)
+    return "/".join(parties[-2:])
+
+
+def _dumps(valeur):
+    return json.dumps(valeur, ensure_ascii=False)
+
+
+class StockageSQLite:
+    """Lecture/écriture des fichiers gérés dans une base SQLite."""
+
+    def __init__(self, chemin=SQLITE_PATH):
+        self.chemin = os.path.abspath(chemin)
+        os.makedirs(os.path.dirname(self.chemin), exist_ok=True)
+        with self._connexion() as cx:
+            cx.executescript(SCHEMA)
+
+    @contextmanager
+    def _connexion(self):
+        # One short-lived connection per operation: safe across the Tk and generation threads
+        cx = sqlite3.connect(self.chemin, timeout=10)
+        try:
+            cx.execute("PRAGMA journal_mode=WAL")
+            with cx:  # commit, or rollback on error
+                yield cx
+        finally:
+            cx.close()
+
+    def gere(self, chemin):
+        return _cle(chemin) in FICHIERS_GERES
+
+    def signature(self):
+        """Change à chaque écriture ; sert d'invalidation au dépôt en mémoire."""
+        signature = []
+        for suffixe in ("", "-wal"):
+            try:
+                st = os.stat(self.chemin + suffixe)
+                signature += [st.st_mtime_ns, st.st_size]
+            except OSError:
+                signature += [None, None]
+        return tuple(signature)
+
+    def contient(self, chemin):
+        cle = _cle(chemin)
+        with self._connexion() as cx:
+            if cx.execute("SELECT 1 FROM documents WHERE fichier = ?", (cle,)).fetchone():
+                return True
+            if cle in TABLES:
+                return cx.execute(f"SELECT 1 FROM {TABLES[cle][0]} LIMIT 1").fetchone() is not None
+            return False
+
+    # ================== CHARGER / SAUVEGARDER ==================
+
+    def charger(self, chemin):
+        cle = _cle(chemin)
+        with self._connexion() as cx:
+            if cle in TABLES:
+                table, _ = TABLES[cle]
+                lignes = [json.loads(d) for (d,) in cx.execute(f"SELECT donnees FROM {table} ORDER BY position")]
+                if cle != AVAILABILITY_FICHIER:
+                    return lignes
+                reste = cx.execute("SELECT contenu FROM documents WHERE fichier = ?", (cle,)).fetchone()
+                data = json.loads(reste[0]) if reste else {}
+                if lignes or reste:
+                    data["blocked_slots"] = lignes
+                return data
+            ligne = cx.execute("SELECT contenu FROM documents WHERE fichier = ?", (cle,)).fetchone()
+            return json.loads(ligne[0]) if ligne else []
+
+    def sauvegarder(self, chemin, data):
+        cle = _cle(chemin)
+        with self._connexion() as cx:
+            if cle not in TABLES:
+                cx.execute("INSERT OR REPLACE INTO documents (fichier, contenu) VALUES (?, ?)", (cle, _dumps(data)))
+                return
+            table, colonnes = TABLES[cle]
+            enregistrements = data
+            if cle == AVAILABILITY_FICHIER:
+                # Other top-level keys are kept as a document next to the table
+                enregistrements = data.get("blocked_slots", [])
+                reste = {k: v for k, v in data.items() if k != "blocked_slots"}
+                cx.execute("INSERT OR REPLACE INTO documents (fichier, contenu) VALUES (?, ?)", (cle, _dumps(reste)))
+            cx.execute(f"DELETE FROM {table}")
+            self._inserer(cx, table, colonnes, enregistrements, 0)
+
+    # ================== AJOUTS / MISES A JOUR ==================
+
+    def _inserer(self, cx, table, colonnes, enregistrements, debut):
+        cx.executemany(
+            f"INSERT INTO {table} (position, {', '.join(colonnes)}, donnees) "
+            f"VALUES (?, {', '.join('?' * len(colonnes))}, ?)",
+            [(debut + i, *(e.get(c) for c in colonnes), _dumps(e)) for i, e in enumerate(enregistrements)]
+        )
+
+    def ajouter(self, chemin, enregistrements):
+        """Ajoute des enregistrements en fin de liste sans réécrire les autres."""
+        cle = _cle(chemin)
+        with self._connexion() as cx:
+            cx.execute("BEGIN IMMEDIATE")
+            if cle in TABLES and cle != AVAILABILITY_FICHIER:
+                table, colonnes = TABLES[cle]
+                (suivante,) = cx.execute(f"SELECT COALESCE(MAX(position) + 1, 0) FROM {table}").fetchone()
+                self._inserer(cx, table, colonnes, enregistrements, suivante)
+                return
+            ligne = cx.execute("SELECT contenu FROM documents WHERE fichier = ?", (cle,)).fetchone()
+            contenu = json.loads(ligne[0]) if ligne else []
+            contenu.extend(enregistrements)
+            cx.execute("INSERT OR REPLACE INTO documents (fichier, contenu) VALUES (?, ?)", (cle, _dumps(contenu)))
+
+    def modifier(self, chemin, modifications):
+        """
+        Applique {id: champs} aux enregistrements concernés seulement.
+
+        Returns:
+            list: ids effectivement modifiés
+        """
+        cle = _cle(chemin)
+        ids = []
+        with self._connexion() as cx:
+            cx.execute("BEGIN IMMEDIATE")
+            if cle in TABLES and cle != AVAILABILITY_FICHIER:
+                table, colonnes = TABLES[cle]
+                lignes = cx.execute(
+                    f"SELECT position, donnees FROM {table} "
+                    f"WHERE json_extract(donnees, '$.id') IN ({', '.join('?' * len(modifications))})",
+                    list(modifications)
+                ).fetchall()
+                for position, donnees in lignes:
+                    e = json.loads(donnees)
+                    e.update(modifications[e["id"]])
+                    cx.execute(
+                        f"UPDATE {table} SET {', '.join(c + ' = ?' for c in colonnes)}, donnees = ? WHERE position = ?",
+                        (*(e.get(c) for c in colonnes), _dumps(e), position)
+                    )
+                    ids.append(e["id"])
+                return ids
+            ligne = cx.execute("SELECT contenu FROM documents WHERE fichier = ?", (cle,)).fetchone()
+            contenu = json.loads(ligne[0]) if ligne else []
+            for e in contenu:
+                champs = modifications.get(e.get("id"))
+                if champs is not None:
+                    e.update(champs)
+                    ids.append(e["id"])
+            if ids:
+                cx.execute("UPDATE documents SET contenu = ? WHERE fichier = ?", (_dumps(contenu), cle))
+        return ids
+
+    # ================== REQUETES INDEXEES ==================
+
+    def _requete(self, sql, params):
+        with self._connexion() as cx:
+            return [json.loads(d) for (d,) in cx.execute(sql, params)]
+
+    def seances_enseignant(self, enseignant):
+        return self._requete("SELECT donnees FROM seances WHERE enseignant = ? ORDER BY position", (enseignant,))
+
+    def seances_groupe(self, groupe):
+        return self._requete("SELECT donnees FROM seances WHERE groupe = ? ORDER BY position", (groupe,))
+
+    def seances_creneau(self, jour, debut):
+        return self._requete("SELECT donnees FROM seances WHERE jour = ? AND debut = ? ORDER BY position", (jour, debut))
+
+    def reservations_salle(self, salle, jour, debut, statut=None):
+        if statut is None:
+            return self._requete(
+                "SELECT donnees FROM reservations WHERE salle = ? AND jour = ? AND debut = ? ORDER BY position",
+                (salle, jour, debut)
+            )
+        return self._requete(
+            "SELECT donnees FROM reservations WHERE salle = ? AND jour = ? AND debut = ? AND statut = ? ORDER BY position",
+            (salle, jour, debut, statut)
+        )
+
+    def salles_occupees(self, jour, debut, blocages=True):
+        """Salles prises sur un créneau : EDT, réservations acceptées et (si blocages) salles bloquées."""
+        sql = ("SELECT salle FROM seances WHERE jour = ?1 AND debut = ?2 "
+               "UNION SELECT salle FROM reservations WHERE jour = ?1 AND debut = ?2 AND statut = 'Acceptée'")
+        if blocages:
+            sql += " UNION SELECT salle FROM blocages WHERE jour = ?1 AND debut = ?2 AND salle IS NOT NULL"
+        with self._connexion() as cx:
+            return {salle for (salle,) in cx.execute(sql, (jour, debut))}
+
+    # ================== IMPORT / EXPORT ==================
+
+    def importer_json(self, racine="."):
+        """Copie les fichiers JSON existants dans la base. Retourne les fichiers importés."""
+        importes = []
+        for cle in FICHIERS_GERES:
+            source = os.path.join(racine, cle)
+            if not os.path.exists(source):
+                continue
+            with open(source, "r", encoding="utf-8") as f:
+                self.sauvegarder(cle, json.load(f))
+            importes.append(cle)
+        return importes
+
+    def exporter_json(self, racine="."):
+        """Réécrit les fichiers JSON présents dans la base. Retourne les fichiers exportés."""
+        exportes = []
+        for cle in FICHIERS_GERES:
+            if not self.contient(cle):
+                continue
+            cible = os.path.join(racine, cle)
+            os.makedirs(os.path.dirname(cible), exist_ok=True)
+            with open(cible, "w", encoding="utf-8") as f:
+                json.dump(self.charger(cle), f, indent=4, ensure_ascii=False)
+            exportes.append(cle)
+        return exportes
+
+
+if __name__ == "__main__":
+    action = sys.argv[1] if len(sys.argv) > 1 else ""
+    stockage = StockageSQLite(os.environ.get("EDT_SQLITE_PATH", SQLITE_PATH))
+    if action == "importer":
+        print("Importés :", ", ".join(stockage.importer_json()))
+    elif action == "exporter":
+        print("Exportés :", ", ".join(stockage.exporter_json()))
+    else:
+        print("Usage: python -m logic.stockage_sqlite importer|exporter")
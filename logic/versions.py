@@ -0,0 +1,219 @@
+"""
+Historique versionné de l'emploi du temps.
+
+Chaque generer_edt() ou replanification enregistre une version dans
+GESTION EDT/versions/. Une version ne stocke que le diff avec sa parente,
+par id de séance :
+  - ajoutees   : séances nouvelles (enregistrement complet)
+  - supprimees : ids disparus
+  - modifiees  : [id, {champ: nouvelle valeur}] (séance déplacée, changée de salle...)
+  - ordre      : ordre des ids, seulement s'il diffère de l'ordre reconstruit
+Toutes les CHECKPOINT_TOUS versions (ou si le diff est presque aussi gros
+que l'EDT), la version est un point de contrôle complet. Reconstruire une
+version part du point de contrôle précédent et applique au plus
+CHECKPOINT_TOUS - 1 diffs.
+"""
+
+import datetime
+import json
+import os
+
+from logic.ecriture import ecrire_flux, verrou_fichier
+from logic.flux_json import morceaux_json
+
+VERSIONS_DIR = "GESTION EDT/versions"
+CHECKPOINT_TOUS = 10
+
+# (dossier, version) -> état, pour éviter de rejouer la chaîne à chaque enregistrement
+_cache = {}
+
+
+# ================== STOCKAGE ==================
+
+def _index_path(dossier):
+    return os.path.join(dossier, "index.json")
+
+
+def lister_versions(dossier=VERSIONS_DIR):
+    """Métadonnées des versions, de la plus ancienne à la plus récente."""
+    try:
+        with open(_index_path(dossier), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return []
+
+
+def _lire(dossier, meta):
+    with open(os.path.join(dossier, meta["fichier"]), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _ecrire(chemin, data):
+    ecrire_flux(chemin, morceaux_json(data, "compact"), fsync=False)
+
+
+# ================== DIFF ==================
+
+def _cle(seance):
+    """Id stable de la séance ; à défaut, son contenu (vue comme supprimée + ajoutée si elle change)."""
+    if seance.get("id") is not None:
+        return seance["id"]
+    return json.dumps(seance, sort_keys=True, ensure_ascii=False)
+
+
+def calculer_diff(avant, apres):
+    """Diff entre deux EDT (listes de séances)."""
+    anciens = {_cle(s): s for s in avant}
+    nouveaux = {_cle(s): s for s in apres}
+    ajoutees = [s for k, s in nouveaux.items() if k not in anciens]
+    supprimees = [k for k in anciens if k not in nouveaux]
+    modifiees = []
+    for k, s in nouveaux.items():
+        ancien = anciens.get(k)
+        if ancien is None or ancien == s:
+            continue
+        champs = {c: v for c, v in s.items() if ancien.get(c, object()) != v}
+        retires = [c for c in ancien if c not in s]
+        modifiees.append([k, champs, retires] if retires else [k, champs])
+
+    diff = {"ajoutees": ajoutees, "supprimees": supprimees, "modifiees": modifiees}
+    if [_cle(s) for s in appliquer_diff(avant, diff)] != list(nouveaux):
+        diff["ordre"] = list(nouveaux)
+    return diff
+
+
+def appliquer_diff(etat, diff):
+    """Nouvel EDT = etat + diff (etat n'est pas modifié)."""
+    supprimees = set(diff["supprimees"])
+    modifs = {m[0]: m for m in diff["modifiees"]}
+    resultat = []
+    for s in etat:
+        k = _cle(s)
+        if k in supprimees:
+            continue
+        m = modifs.get(k)
+        if m is not None:
+            s = dict(s, **m[1])
+            for c in (m[2] if len(m) > 2 else ()):
+                s.pop(c, None)
+        resultat.append(s)
+    resultat.extend(diff["ajoutees"])
+    if "ordre" in diff:
+        par_cle = {_cle(s): s for s in resultat}
+        resultat = [par_cle[k] for k in diff["ordre"]]
+    return resultat
+
+
+def _taille(diff):
+    return len(diff["ajoutees"]) + len(diff["supprimees"]) + len(diff["modifiees"])
+
+
+# ================== VERSIONS ==================
+
+def charger_version(version, dossier=VERSIONS_DIR, versions=None):
+    """EDT tel qu'il était à la version donnée."""
+    cle = (os.path.abspath(dossier), version)
+    if cle in _cache:
+        return [dict(s) for s in _cache[cle]]
+    versions = versions if versions is not None else lister_versions(dossier)
+    par_numero = {v["version"]: v for v in versions}
+    if version not in par_numero:
+        raise KeyError(f"Version {version} inconnue")
+
+    # Walk back to the nearest full checkpoint, then replay forward
+    chaine = []
+    meta = par_numero[version]
+    while meta["type"] != "complet":
+        chaine.append(meta)
+        meta = par_numero[meta["parent"]]
+    etat = _lire(dossier, meta)
+    for meta in reversed(chaine):
+        etat = appliquer_diff(etat, _lire(dossier, meta))
+    _cache.clear()
+    _cache[cle] = etat
+    return [dict(s) for s in etat]
+
+
+def enregistrer_version(edt, motif="", dossier=VERSIONS_DIR):
+    """
+    Enregistre l'EDT comme nouvelle version (rien si identique à la dernière).
+
+    Returns:
+        int | None: numéro de la version créée
+    """
+    os.makedirs(dossier, exist_ok=True)
+    with verrou_fichier(_index_path(dossier)):
+        versions = lister_versions(dossier)
+        parent = versions[-1] if versions else None
+        numero = parent["version"] + 1 if parent else 1
+
+        diff = None
+        if parent is not None:
+            diff = calculer_diff(charger_version(parent["version"], dossier, versions), edt)
+            if not _taille(diff) and "ordre" not in diff:
+                return None
+        depuis_checkpoint = 0
+        if parent is not None:
+            par_numero = {v["version"]: v for v in versions}
+            meta = parent
+            while meta["type"] != "complet":
+                depuis_checkpoint += 1
+                meta = par_numero[meta["parent"]]
+        complet = (
+            diff is None
+            or depuis_checkpoint + 1 >= CHECKPOINT_TOUS
+            or _taille(diff) * 2 > len(edt)
+        )
+
+        fichier = f"v{numero:06d}.json"
+        _ecrire(os.path.join(dossier, fichier), list(edt) if complet else diff)
+        meta = {
+            "version": numero,
+            "parent": parent["version"] if parent else None,
+            "type": "complet" if complet else "diff",
+            "fichier": fichier,
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "motif": motif,
+            "nb_seances": len(edt),
+        }
+        if diff is not None:
+            meta.update(ajoutees=len(diff["ajoutees"]), supprimees=len(diff["supprimees"]),
+                        modifiees=len(diff["modifiees"]))
+        versions.append(meta)
+        _ecrire(_index_path(dossier), versions)
+
+        _cache.clear()
+        _cache[(os.path.abspath(dossier), numero)] = [dict(s) for s in edt]
+        return numero
+
+
+def diff_versions(a, b, groupe=None, dossier=VERSIONS_DIR):
+    """
+    Ce qui a changé entre les versions a et b, éventuellement pour un seul groupe.
+
+    Returns:
+        dict: {"ajoutees": [...], "supprimees": [...], "deplacees": [(avant, après), ...]}
+    """
+    avant = {_cle(s): s for s in charger_version(a, dossier)}
+    apres = {_cle(s): s for s in charger_version(b, dossier)}
+
+    def concerne(s):
+        return groupe is None or s.get("groupe") == groupe
+
+    return {
+        "ajoutees": [s for k, s in apres.items() if k not in avant and concerne(s)],
+        "supprimees": [s for k, s in avant.items() if k not in apres and concerne(s)],
+        "deplacees": [
+            (avant[k], s) for k, s in apres.items()
+            if k in avant and avant[k] != s and (concerne(s) or concerne(avant[k]))
+        ],
+    }
+
+
+def restaurer_version(version, chemin="GESTION EDT/emplois_du_temps.json", dossier=VERSIONS_DIR):
+    """Remet l'EDT d'une version en place (et l'enregistre comme nouvelle version)."""
+    from logic.database import sauvegarder_json
+    edt = charger_version(version, dossier)
+    sauvegarder_json(chemin, edt)
+    enregistrer_version(edt, f"Restauration de la version {version}", dossier)
+    return edt